@@ -2,28 +2,98 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import ModuleType
+from typing import TYPE_CHECKING, TextIO
 
 if TYPE_CHECKING:
     import hunter
 
 _logger: logging.Logger | None = None
+_hunter: ModuleType | None = None
 _hunter_trace: hunter.Tracer | None = None
 
+DEBUG_ENV_VAR = "KICANDY_DEBUG"
+LOG_FILE = Path("/tmp/kicad-kicandy.log")
+TRACE_MODULES: tuple[str, ...] = (
+    "font_management",
+    "icon_fonts",
+    "icon_repository",
+    "kicandy_action",
+    "state_store",
+    "ui",
+)
+# Submodules of plugin packages; the trailing dot keeps e.g. "uiautomation" out.
+TRACE_PACKAGES: tuple[str, ...] = ("ui.",)
+TRACE_MAX_DEPTH = 8
+
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_INTERVAL_S = 30.0
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that batches writes and flushes periodically or on errors."""
+
+    def __init__(self, filename: Path, flush_interval: float = _LOG_FLUSH_INTERVAL_S) -> None:
+        self._flush_interval = flush_interval
+        self._stop_flush = threading.Event()
+        super().__init__(filename, mode="a", encoding="utf-8")
+        # One long-lived daemon thread flushes the buffer until the handler is closed.
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="kicandy-log-flush", daemon=True
+        )
+        self._flush_thread.start()
+
+    def _open(self) -> TextIO:
+        return open(
+            self.baseFilename, self.mode, buffering=_LOG_BUFFER_SIZE, encoding=self.encoding
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if record.levelno >= logging.ERROR:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flush.wait(self._flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop_flush.set()
+        super().close()
+
+
+def debug_enabled() -> bool:
+    return os.environ.get(DEBUG_ENV_VAR) == "1"
+
 
 def get_logger() -> logging.Logger:
-    """Return a configured debug logger that writes to /tmp/kicad-kicandy.log."""
+    """Return the debug logger; it only writes to /tmp/kicad-kicandy.log with KICANDY_DEBUG=1."""
     global _logger
     if _logger is not None:
         return _logger
 
     _logger = logging.getLogger("kicandy")
+    if not debug_enabled():
+        # Disabled loggers never open the log file; isEnabledFor() short-circuits all calls.
+        _logger.setLevel(logging.CRITICAL + 1)
+        _logger.addHandler(logging.NullHandler())
+        _logger.propagate = False
+        return _logger
+
     _logger.setLevel(logging.DEBUG)
 
-    log_file = Path("/tmp/kicad-kicandy.log")
-    handler = logging.FileHandler(log_file, mode="a")
+    handler = _BufferedFileHandler(LOG_FILE)
     handler.setLevel(logging.DEBUG)
 
     formatter = logging.Formatter(
@@ -33,26 +103,42 @@ def get_logger() -> logging.Logger:
     handler.setFormatter(formatter)
 
     _logger.addHandler(handler)
+    atexit.register(handler.flush)
     _logger.info("Debug logging initialized")
 
     return _logger
 
 
+def _import_hunter() -> ModuleType:
+    global _hunter
+    if _hunter is None:
+        import hunter
+
+        _hunter = hunter
+    return _hunter
+
+
+def _trace_query(hunter: ModuleType) -> hunter.Query:
+    """Match call/return events of plugin modules, capped at TRACE_MAX_DEPTH."""
+    modules = hunter.Q(module_in=TRACE_MODULES) | hunter.Q(module_startswith=TRACE_PACKAGES)
+    return hunter.Q(kind_in=("call", "return"), depth_lt=TRACE_MAX_DEPTH) & modules
+
+
 def start_trace() -> None:
     """Start Hunter trace to /tmp/kicad-kicandy.trace, filtering to project code only."""
     global _hunter_trace
     if _hunter_trace is not None:
         return
 
-    import hunter
+    hunter = _import_hunter()
 
     trace_file = Path("/tmp/kicad-kicandy.trace")
     stream = trace_file.open("a", buffering=1, encoding="utf-8")
 
-    # Trace all function calls in non-stdlib code
+    # Filter inside the tracer: only call/return events of plugin modules, depth-capped
     _hunter_trace = hunter.trace(
-        ~hunter.Q(stdlib=True),
-        action=hunter.CallPrinter(stream=stream, force_colors=True),
+        _trace_query(hunter),
+        action=hunter.CallPrinter(stream=stream, force_colors=False),
         threading_support=True,
     )
 
@@ -66,9 +152,7 @@ def stop_trace() -> None:
     if _hunter_trace is None:
         return
 
-    import hunter
-
-    hunter.stop()
+    _import_hunter().stop()
     _hunter_trace = None
 
     logger = get_logger()
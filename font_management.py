@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import json
+import os
+import time
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
 from typing import Callable
 
 from icon_fonts import (
-    ICON_FONTS,
     IconFont,
-    get_font_install_paths,
+    get_icon_fonts,
     install_font_files,
     remove_font_files,
+    resolve_font_install_dir,
 )
-from icon_repository import IconRepository
+from icon_repository import IconRepository, resolve_cache_dir
 from state_store import PluginState
 
 try:  # pragma: no cover - wx is unavailable in unit tests
@@ -21,11 +26,15 @@ except ImportError:  # pragma: no cover - handled gracefully
 
 
 _NEW_FONTS_INSTALLED = False
+_FONT_INSTALL_GENERATION = 0
+# Fonts installed outside KiCandy are picked up once a cached detection result expires.
+FONT_DETECTION_CACHE_TTL_S = 300.0
 
 
 def mark_fonts_installed() -> None:
-    global _NEW_FONTS_INSTALLED
+    global _NEW_FONTS_INSTALLED, _FONT_INSTALL_GENERATION
     _NEW_FONTS_INSTALLED = True
+    _FONT_INSTALL_GENERATION += 1
 
 
 def fonts_pending_restart() -> bool:
@@ -59,30 +68,40 @@ class FontManager:
     ) -> None:
         self.repository = repository
         self.state = state
-        resolved_fonts = tuple(fonts) if fonts is not None else ICON_FONTS
-        self._font_map: dict[str, IconFont] = {font.identifier: font for font in resolved_fonts}
+        resolved_fonts = tuple(fonts) if fonts is not None else get_icon_fonts()
+        self._font_map: Mapping[str, IconFont] = MappingProxyType(
+            {font.identifier: font for font in resolved_fonts}
+        )
+        self._fonts_by_name: tuple[IconFont, ...] = tuple(
+            sorted(self._font_map.values(), key=lambda item: item.display_name)
+        )
+        self._fonts_by_family: tuple[IconFont, ...] = tuple(
+            sorted(self._font_map.values(), key=lambda item: item.font_family.lower())
+        )
+        self._installed_names: frozenset[str] | None = None
+        self._facenames: frozenset[str] | None = None
+        self._facenames_generation = -1
 
     def available_fonts(self) -> list[IconFont]:
         deleted = self.state.model.deleted_fonts
-        fonts = [font for font in self._font_map.values() if font.identifier not in deleted]
-        return sorted(fonts, key=lambda item: item.display_name)
+        return [font for font in self._fonts_by_name if font.identifier not in deleted]
 
     def get_font(self, identifier: str) -> IconFont | None:
         return self._font_map.get(identifier)
 
     def font_status_rows(self) -> list[FontStatusRow]:
-        enumerator = wx.FontEnumerator() if wx is not None else None
+        facenames = self._system_facenames()
         deleted = self.state.model.deleted_fonts
+        destination = resolve_font_install_dir()
+        installed_names = (
+            self._installed_font_names(destination) if destination is not None else frozenset()
+        )
         rows: list[FontStatusRow] = []
-        for font in self._font_map.values():
-            install_paths = get_font_install_paths(font)
-            installable = bool(install_paths)
-            installed = any(path.exists() for path in install_paths)
-            uninstallable = bool(install_paths) and installed
-            codepoints_cached = self.repository.has_cached_font(font.identifier)
-            glyph_count = (
-                self.repository.cached_glyph_count(font.identifier) if codepoints_cached else 0
-            )
+        for font in self._fonts_by_family:
+            installable = destination is not None and bool(font.ttf_files)
+            installed = not installed_names.isdisjoint(font.ttf_filenames)
+            uninstallable = installable and installed
+            codepoints_cached, glyph_count = self.repository.font_cache_summary(font.identifier)
             rows.append(
                 FontStatusRow(
                     identifier=font.identifier,
@@ -93,9 +112,7 @@ class FontManager:
                     glyph_count=glyph_count,
                     is_installed=installed,
                     codepoints_cached=codepoints_cached,
-                    wx_available=enumerator.IsValidFacename(font.font_family)
-                    if enumerator is not None
-                    else False,
+                    wx_available=font.font_family.lower() in facenames,
                     info_url=font.info_url,
                     license_text=font.license_text,
                     deleted=font.identifier in deleted,
@@ -103,7 +120,6 @@ class FontManager:
                     uninstallable=uninstallable,
                 )
             )
-        rows.sort(key=lambda item: item.family.lower())
         return rows
 
     def install_fonts(
@@ -115,13 +131,14 @@ class FontManager:
         fonts = [self._font_map[font_id] for font_id in font_ids if font_id in self._font_map]
         if not fonts:
             return
+        self._installed_names = None
         installed = install_font_files(
             fonts, source_label="Selected fonts", progress_cb=progress_cb
         )
         if not installed:
             return
         mark_fonts_installed()
-        deleted = set(self.state.model.deleted_fonts)
+        deleted = self.state.model.deleted_fonts
         updated = deleted.difference(font.identifier for font in fonts)
         if updated != deleted:
             self.state.update_deleted_fonts(updated)
@@ -131,27 +148,105 @@ class FontManager:
             self.repository.ensure_font(font.identifier)
 
     def uninstall_fonts(self, font_ids: Sequence[str]) -> list[str]:
+        destination = resolve_font_install_dir()
+        if destination is None:
+            return []
+        installed_names = self._installed_font_names(destination)
         candidates: list[IconFont] = []
         for font_id in font_ids:
             font = self._font_map.get(font_id)
             if font is None:
                 continue
-            paths = get_font_install_paths(font)
-            if not paths:
-                continue
-            if not any(path.exists() for path in paths):
+            if installed_names.isdisjoint(font.ttf_filenames):
                 continue
             candidates.append(font)
         if not candidates:
             return []
+        self._installed_names = None
         removed = remove_font_files(candidates)
         if not removed:
             return []
-        deleted = set(self.state.model.deleted_fonts)
-        for font in candidates:
-            deleted.add(font.identifier)
+        deleted = self.state.model.deleted_fonts.union(font.identifier for font in candidates)
         self.state.update_deleted_fonts(deleted)
         return [font.identifier for font in candidates]
 
+    def _system_facenames(self) -> frozenset[str]:
+        """Return lowercased system font facenames, enumerated once per install generation."""
+        if wx is None:
+            return frozenset()
+        if self._facenames is None or self._facenames_generation != _FONT_INSTALL_GENERATION:
+            self._facenames = _enumerate_facenames()
+            self._facenames_generation = _FONT_INSTALL_GENERATION
+        return self._facenames
+
+    def _installed_font_names(self, directory: Path) -> frozenset[str]:
+        if self._installed_names is None:
+            self._installed_names = _scan_file_names(directory)
+        return self._installed_names
+
     def deleted_fonts(self) -> set[str]:
         return set(self.state.model.deleted_fonts)
+
+
+def resolve_font_detection_cache(cache_dir: Path | None = None) -> Path:
+    return resolve_cache_dir(cache_dir) / "font_detection.json"
+
+
+def detect_missing_families(families: Sequence[str], cache_path: Path) -> frozenset[str]:
+    """Return the families wx cannot find, reusing a recent result stored at cache_path."""
+    key = _font_detection_key(families)
+    missing = _read_font_detection(cache_path, key)
+    if missing is not None:
+        return missing
+    if wx is None:
+        return frozenset(families)
+    # One enumeration answers every family; IsValidFacename may rescan the fonts per call.
+    available = _enumerate_facenames()
+    missing = frozenset(family for family in families if family.lower() not in available)
+    payload = {"key": key, "checked_at": time.time(), "missing": sorted(missing)}
+    try:
+        cache_path.write_text(json.dumps(payload))
+    except OSError:
+        pass
+    return missing
+
+
+def _enumerate_facenames() -> frozenset[str]:
+    """Return the lowercased facenames of every font wx can see."""
+    return frozenset(name.lower() for name in wx.FontEnumerator.GetFacenames())
+
+
+def _font_detection_key(families: Sequence[str]) -> list[object]:
+    # Installing or removing fonts through KiCandy touches the install directory.
+    destination = resolve_font_install_dir()
+    try:
+        install_mtime = destination.stat().st_mtime_ns if destination is not None else None
+    except OSError:
+        install_mtime = None
+    return [sorted(set(families)), install_mtime]
+
+
+def _read_font_detection(cache_path: Path, key: list[object]) -> frozenset[str] | None:
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    checked_at = data.get("checked_at")
+    if not isinstance(checked_at, (int, float)):
+        return None
+    if not 0 <= time.time() - checked_at < FONT_DETECTION_CACHE_TTL_S:
+        return None
+    missing = data.get("missing")
+    if not isinstance(missing, list):
+        return None
+    return frozenset(value for value in missing if isinstance(value, str))
+
+
+def _scan_file_names(directory: Path) -> frozenset[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
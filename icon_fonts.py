@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import bisect
+import functools
+import http.client
 import json
 import os
 import platform
@@ -9,18 +12,31 @@ import re
 import shutil
 import ssl
 import subprocess
+import sys
 import tempfile
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable
-from urllib.error import HTTPError, URLError
+from types import MappingProxyType
+from typing import BinaryIO, Callable
+from urllib.error import HTTPError
 from urllib.parse import unquote
 from urllib.request import Request, urlopen
 
 import certifi
 
+try:  # pragma: no cover - optional streaming JSON parser
+    import ijson
+except ImportError:  # pragma: no cover - falls back to json.load
+    ijson = None  # type: ignore[assignment]
+
+_JSON_ERRORS: tuple[type[Exception], ...] = (ValueError,)
+if ijson is not None:  # pragma: no cover - depends on optional dependency
+    _JSON_ERRORS += (ijson.JSONError,)
+
 
 @dataclass(frozen=True)
 class IconFontFile:
@@ -28,6 +44,10 @@ class IconFontFile:
 
     url: str
     format: str
+    filename: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "filename", self.url.rsplit("/", 1)[-1])
 
 
 FONT_WEIGHT_NAMES: tuple[str, ...] = (
@@ -55,26 +75,27 @@ def weight_position_for_name(name: str) -> int:
 
 
 def resolve_weight_choice(desired: str, available: Sequence[str]) -> str:
-    desired_pos = weight_position_for_name(desired)
-    best_name = desired
-    best_pos = None
-    best_distance = None
-    for name in available:
-        if name not in _FONT_WEIGHT_INDEX:
-            continue
-        candidate_pos = _FONT_WEIGHT_INDEX[name]
-        distance = abs(candidate_pos - desired_pos)
-        if best_distance is None or distance < best_distance:
-            best_distance = distance
-            best_pos = candidate_pos
-            best_name = name
-            continue
-        if distance == best_distance and best_pos is not None and candidate_pos > best_pos:
-            best_pos = candidate_pos
-            best_name = name
-    if best_distance is None:
+    return _resolve_weight_choice(desired, tuple(available))
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_weight_choice(desired: str, available: tuple[str, ...]) -> str:
+    positions = sorted(
+        {_FONT_WEIGHT_INDEX[name] for name in available if name in _FONT_WEIGHT_INDEX}
+    )
+    if not positions:
         return desired
-    return best_name
+    desired_pos = weight_position_for_name(desired)
+    index = bisect.bisect_left(positions, desired_pos)
+    if index == len(positions):
+        best_pos = positions[-1]
+    elif index == 0:
+        best_pos = positions[0]
+    else:
+        lower, upper = positions[index - 1], positions[index]
+        # Ties prefer the heavier weight.
+        best_pos = upper if upper - desired_pos <= desired_pos - lower else lower
+    return FONT_WEIGHT_NAMES[best_pos - 1]
 
 
 @dataclass(frozen=True)
@@ -90,6 +111,21 @@ class IconFont:
     available_weights: tuple[str, ...] = (DEFAULT_FONT_WEIGHT,)
     info_url: str | None = None
     license_text: str | None = None
+    ttf_files: tuple[IconFontFile, ...] = field(init=False, repr=False, compare=False)
+    # TTF file names as installed on disk, including URL-decoded variants.
+    ttf_filenames: frozenset[str] = field(init=False, repr=False, compare=False)
+    # Label shown next to the icon set's checkbox, e.g. "Material Symbols (Outlined)".
+    choice_label: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Interned identifiers let dict lookups keyed by them hit the identity fast path.
+        object.__setattr__(self, "identifier", sys.intern(self.identifier))
+        object.__setattr__(self, "choice_label", f"{self.display_name} ({self.style_label})")
+        ttf_files = tuple(item for item in self.font_files if item.format.lower() == "ttf")
+        object.__setattr__(self, "ttf_files", ttf_files)
+        filenames = {item.filename for item in ttf_files}
+        filenames.update(unquote(name) for name in tuple(filenames))
+        object.__setattr__(self, "ttf_filenames", frozenset(filenames))
 
 
 class IconFontSource(ABC):
@@ -109,32 +145,107 @@ class IconFontSource(ABC):
     def _build_fonts(self) -> tuple[IconFont, ...]: ...
 
     @abstractmethod
-    def download_codepoints(self, font: IconFont, destination: Path) -> None: ...
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
+        """Write codepoints to destination and return the upstream ETag, if known.
+
+        With an etag, raise CodepointsNotModified when the upstream file is unchanged.
+        """
 
     def install_fonts(self) -> None:
         _install_ttf_fonts(self.identifier, self.fonts, self.install_url)
 
 
 _USER_AGENT = "kicandy-icon-fetcher"
-_SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+_MAX_DOWNLOAD_WORKERS = 8
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_SSL_CONTEXT: ssl.SSLContext | None = None
 
 
-def _download_to_path(url: str, destination: Path) -> None:
-    request = Request(url, headers={"User-Agent": _USER_AGENT})
+def _get_ssl_context() -> ssl.SSLContext:
+    """Create the certifi-backed SSL context on first download rather than at import."""
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+    return _SSL_CONTEXT
+
+
+class CodepointsNotModified(Exception):
+    """Raised by a conditional download when the server reports the resource unchanged."""
+
+
+@contextmanager
+def _open_download(url: str, etag: str | None = None) -> Generator[BinaryIO, None, None]:
+    headers = {"User-Agent": _USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    request = Request(url, headers=headers)
     try:
-        with urlopen(request, timeout=30, context=_SSL_CONTEXT) as response:
-            destination.write_bytes(response.read())
-    except (URLError, HTTPError) as exc:  # pragma: no cover - network error path
+        with urlopen(request, timeout=30, context=_get_ssl_context()) as response:
+            yield response
+    except HTTPError as exc:
+        if exc.code == 304:
+            raise CodepointsNotModified(url) from None
         raise RuntimeError(f"Unable to download {url}: {exc}") from exc
+    except (OSError, http.client.HTTPException) as exc:  # pragma: no cover - network error path
+        raise RuntimeError(f"Unable to download {url}: {exc}") from exc
+
+
+def _response_etag(response: BinaryIO) -> str | None:
+    getheader = getattr(response, "getheader", None)
+    return getheader("ETag") if getheader is not None else None
+
 
+def _download_to_path(url: str, destination: Path, etag: str | None = None) -> str | None:
+    """Stream url into destination and return the response ETag, if any."""
+    with _open_download(url, etag) as response, destination.open("wb") as output:
+        shutil.copyfileobj(response, output, _DOWNLOAD_CHUNK_SIZE)
+        return _response_etag(response)
 
-def _download_text_resource(url: str) -> str:
-    request = Request(url, headers={"User-Agent": _USER_AGENT})
+
+def _download_bytes(url: str) -> bytes:
+    with _open_download(url) as response:
+        return response.read()
+
+
+@contextmanager
+def _atomic_destination(destination: Path) -> Generator[Path, None, None]:
+    """Yield a sibling partial path that replaces destination only if the block succeeds."""
+    partial = destination.with_name(f"{destination.name}.partial")
     try:
-        with urlopen(request, timeout=30, context=_SSL_CONTEXT) as response:
-            return response.read().decode("utf-8")
-    except (URLError, HTTPError) as exc:  # pragma: no cover - network error path
-        raise RuntimeError(f"Unable to download {url}: {exc}") from exc
+        yield partial
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+def _write_lines(destination: Path, lines: Iterable[str]) -> int:
+    """Stream lines to a partial file and replace destination only if at least one was written."""
+    count = 0
+    partial = destination.with_name(f"{destination.name}.partial")
+    try:
+        with partial.open("w", encoding="utf-8") as output:
+            for line in lines:
+                output.write(f"{line}\n")
+                count += 1
+        if count:
+            os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+    return count
+
+
+def _iter_json_array(stream: BinaryIO) -> Iterator[object]:
+    """Yield the items of a top-level JSON array, streaming them when ijson is installed."""
+    if ijson is not None:
+        yield from ijson.items(stream, "item")
+        return
+    payload = json.load(stream)
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array")
+    yield from payload
 
 
 def _install_ttf_fonts(
@@ -151,45 +262,69 @@ def _copy_font_files(
 ) -> None:
     destination.mkdir(parents=True, exist_ok=True)
     total = len(targets)
+    if not total:
+        return
     completed = 0
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        temp_root = Path(tmp_dir)
-        for _, font_file in targets:
-            filename = Path(font_file.url).name
-            temp_path = temp_root / filename
-            _download_to_path(font_file.url, temp_path)
-            shutil.copy2(temp_path, destination / filename)
-            completed += 1
-            if progress_cb is not None:
-                progress_cb(completed, total)
+    # Downloads run in worker threads; progress callbacks stay on this thread.
+    with ThreadPoolExecutor(max_workers=min(_MAX_DOWNLOAD_WORKERS, total)) as executor:
+        futures = [
+            executor.submit(_download_font_file, font_file.url, destination / font_file.filename)
+            for _, font_file in targets
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                if progress_cb is not None:
+                    progress_cb(completed, total)
+        except BaseException:
+            # Fail fast: drop queued downloads instead of waiting for all of them.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def _download_font_file(url: str, target: Path) -> None:
+    with _atomic_destination(target) as partial:
+        _download_to_path(url, partial)
 
 
 def _resolve_windows_font_dir() -> Path:
     local_app_data = os.environ.get("LOCALAPPDATA")
     if not local_app_data:
         raise RuntimeError("LOCALAPPDATA is not set; cannot install fonts.")
-    target = Path(local_app_data) / "Microsoft" / "Windows" / "Fonts"
-    target.mkdir(parents=True, exist_ok=True)
-    return target
-
-
-def _register_windows_font(display_name: str, filename: str) -> None:
-    registry_value = f"{display_name} (TrueType)"
-    subprocess.run(
-        [
-            "reg",
-            "add",
-            "HKCU\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Fonts",
-            "/v",
-            registry_value,
-            "/t",
-            "REG_SZ",
-            "/d",
-            filename,
-            "/f",
-        ],
-        check=True,
-    )
+    return Path(local_app_data) / "Microsoft" / "Windows" / "Fonts"
+
+
+_WINDOWS_FONTS_REGISTRY_KEY = (
+    "HKEY_CURRENT_USER\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Fonts"
+)
+
+
+def _reg_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _import_windows_font_registry(entries: Sequence[tuple[str, str | None]], check: bool) -> None:
+    """Apply all font registry changes with one `reg import`; a None filename deletes the value."""
+    if not entries:
+        return
+    lines = ["Windows Registry Editor Version 5.00", "", f"[{_WINDOWS_FONTS_REGISTRY_KEY}]"]
+    for display_name, filename in entries:
+        name = _reg_string(f"{display_name} (TrueType)")
+        lines.append(f"{name}=-" if filename is None else f"{name}={_reg_string(filename)}")
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".reg", encoding="utf-16", newline="\r\n", delete=False
+    ) as reg_file:
+        reg_file.write("\n".join(lines) + "\n")
+    try:
+        subprocess.run(["reg", "import", reg_file.name], check=check)
+    finally:
+        Path(reg_file.name).unlink(missing_ok=True)
+
+
+def _register_windows_fonts(entries: Sequence[tuple[str, str]]) -> None:
+    _import_windows_font_registry(entries, check=True)
 
 
 def _show_manual_install_message(source_label: str, download_url: str | None) -> None:
@@ -224,8 +359,9 @@ def install_font_files(
     dest_dir, platform_name = destination
     _copy_font_files(targets, dest_dir, progress_cb=progress_cb)
     if platform_name == "windows":
-        for font, font_file in targets:
-            _register_windows_font(font.font_family, Path(font_file.url).name)
+        _register_windows_fonts(
+            [(font.font_family, font_file.filename) for font, font_file in targets]
+        )
     if platform_name == "linux":
         _refresh_font_cache(dest_dir)
     return True
@@ -249,8 +385,7 @@ def remove_font_files(fonts: Sequence[IconFont]) -> bool:
     if not removed:
         return False
     if platform_name == "windows":
-        for font in fonts:
-            _unregister_windows_font(font.font_family)
+        _unregister_windows_fonts([font.font_family for font in fonts])
     if platform_name == "linux":
         _refresh_font_cache(dest_dir)
     return True
@@ -263,10 +398,8 @@ def get_font_install_paths(font: IconFont, destination: Path | None = None) -> l
             return []
         destination, _ = resolved
     paths: list[Path] = []
-    for font_file in font.font_files:
-        if font_file.format.lower() != "ttf":
-            continue
-        filename = Path(font_file.url).name
+    for font_file in font.ttf_files:
+        filename = font_file.filename
         variants = [filename]
         decoded = unquote(filename)
         if decoded != filename:
@@ -279,32 +412,39 @@ def get_font_install_paths(font: IconFont, destination: Path | None = None) -> l
 
 
 def _collect_ttf_targets(fonts: Sequence[IconFont]) -> list[tuple[IconFont, IconFontFile]]:
-    targets: list[tuple[IconFont, IconFontFile]] = []
-    for font in fonts:
-        for font_file in font.font_files:
-            if font_file.format.lower() == "ttf":
-                targets.append((font, font_file))
-    return targets
+    return [(font, font_file) for font in fonts for font_file in font.ttf_files]
 
 
-def _resolve_install_destination(create: bool = True) -> tuple[Path, str] | None:
+@functools.lru_cache(maxsize=1)
+def _platform_install_destination() -> tuple[Path, str] | None:
     system = platform.system().lower()
     if system == "darwin":
-        dest_dir = Path.home() / "Library" / "Fonts"
-        if create:
-            dest_dir.mkdir(parents=True, exist_ok=True)
-        return dest_dir, "darwin"
+        return Path.home() / "Library" / "Fonts", "darwin"
     if system == "windows":
-        dest_dir = _resolve_windows_font_dir()
-        return dest_dir, "windows"
+        return _resolve_windows_font_dir(), "windows"
     if system == "linux":
-        dest_dir = Path.home() / ".local" / "share" / "fonts"
-        if create:
-            dest_dir.mkdir(parents=True, exist_ok=True)
-        return dest_dir, "linux"
+        return Path.home() / ".local" / "share" / "fonts", "linux"
     return None
 
 
+def _resolve_install_destination(create: bool = True) -> tuple[Path, str] | None:
+    resolved = _platform_install_destination()
+    if resolved is None:
+        return None
+    dest_dir, platform_name = resolved
+    if create or platform_name == "windows":
+        dest_dir.mkdir(parents=True, exist_ok=True)
+    return dest_dir, platform_name
+
+
+def resolve_font_install_dir() -> Path | None:
+    """Return the per-user font directory for this platform, or None if unsupported."""
+    resolved = _resolve_install_destination(create=False)
+    if resolved is None:
+        return None
+    return resolved[0]
+
+
 def _refresh_font_cache(destination: Path) -> None:
     try:
         subprocess.run(["fc-cache", "-f", str(destination)], check=False)
@@ -312,19 +452,8 @@ def _refresh_font_cache(destination: Path) -> None:
         pass
 
 
-def _unregister_windows_font(display_name: str) -> None:
-    registry_value = f"{display_name} (TrueType)"
-    subprocess.run(
-        [
-            "reg",
-            "delete",
-            "HKCU\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Fonts",
-            "/v",
-            registry_value,
-            "/f",
-        ],
-        check=False,
-    )
+def _unregister_windows_fonts(display_names: Sequence[str]) -> None:
+    _import_windows_font_registry([(name, None) for name in display_names], check=False)
 
 
 def _font_files(filename: str) -> tuple[IconFontFile, ...]:
@@ -391,8 +520,11 @@ class MaterialSymbolsFontSource(IconFontSource):
             ),
         )
 
-    def download_codepoints(self, font: IconFont, destination: Path) -> None:
-        _download_to_path(font.codepoints_resource, destination)
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
+        with _atomic_destination(destination) as partial:
+            return _download_to_path(font.codepoints_resource, partial, etag)
 
 
 class MaterialDesignIconsFontSource(IconFontSource):
@@ -425,18 +557,23 @@ class MaterialDesignIconsFontSource(IconFontSource):
             ),
         )
 
-    def download_codepoints(self, font: IconFont, destination: Path) -> None:
-        payload = _download_text_resource(font.codepoints_resource)
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
         try:
-            metadata = json.loads(payload)
-        except json.JSONDecodeError as exc:  # pragma: no cover - malformed upstream data
+            with _open_download(font.codepoints_resource, etag) as response:
+                extracted = _write_lines(destination, self._iter_codepoint_lines(response))
+                new_etag = _response_etag(response)
+        except _JSON_ERRORS as exc:  # pragma: no cover - malformed upstream data
             raise RuntimeError("Invalid Material Design Icons metadata") from exc
 
-        if not isinstance(metadata, list):
-            raise RuntimeError("Unexpected Material Design Icons metadata structure")
+        if not extracted:
+            raise RuntimeError("No Material Design Icons glyphs were extracted")
+        return new_etag
 
-        lines: list[str] = []
-        for entry in metadata:
+    @staticmethod
+    def _iter_codepoint_lines(stream: BinaryIO) -> Iterator[str]:
+        for entry in _iter_json_array(stream):
             if not isinstance(entry, dict):
                 continue
             if entry.get("deprecated"):
@@ -447,22 +584,16 @@ class MaterialDesignIconsFontSource(IconFontSource):
                 continue
             if not name or not codepoint:
                 continue
-            lines.append(f"{name} {codepoint}")
-
-        if not lines:
-            raise RuntimeError("No Material Design Icons glyphs were extracted")
-
-        destination.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            yield f"{name} {codepoint}"
 
 
 class RemixIconFontSource(IconFontSource):
     identifier = "remix-icon"
     install_url = "https://github.com/Remix-Design/RemixIcon"
+    # Matched against the raw CSS bytes so the payload is never decoded as a whole.
     _CSS_GLYPH_PATTERN = re.compile(
-        r"""
-        \.ri-([a-z0-9-]+):before\s*\{\s*content:\s*['\"]\\([0-9a-fA-F]+)['\"];?
-        """,
-        re.IGNORECASE | re.VERBOSE,
+        rb"\.ri-([a-z0-9-]+):before\s*\{\s*content:\s*['\"]\\([0-9a-f]+)['\"]",
+        re.IGNORECASE | re.ASCII,
     )
 
     def _build_fonts(self) -> tuple[IconFont, ...]:
@@ -490,41 +621,77 @@ class RemixIconFontSource(IconFontSource):
             ),
         )
 
-    def download_codepoints(self, font: IconFont, destination: Path) -> None:
-        payload = _download_text_resource(font.codepoints_resource)
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
+        with _open_download(font.codepoints_resource, etag) as response:
+            payload = response.read()
+            new_etag = _response_etag(response)
         lines: list[str] = []
         for match in self._CSS_GLYPH_PATTERN.finditer(payload):
             name, codepoint = match.groups()
             if not name or not codepoint:
                 continue
-            lines.append(f"{name} {codepoint.lower()}")
+            lines.append(f"{name.decode('ascii')} {codepoint.decode('ascii').lower()}")
 
         if not lines:
             raise RuntimeError("No Remix Icon glyphs were extracted")
 
-        destination.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with _atomic_destination(destination) as partial:
+            partial.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return new_etag
 
 
-ICON_FONT_SOURCES: tuple[IconFontSource, ...] = (
-    MaterialSymbolsFontSource(),
-    MaterialDesignIconsFontSource(),
-    RemixIconFontSource(),
-)
+@functools.lru_cache(maxsize=1)
+def get_icon_font_sources() -> tuple[IconFontSource, ...]:
+    """Build the font sources on first use instead of at import time."""
+    return (
+        MaterialSymbolsFontSource(),
+        MaterialDesignIconsFontSource(),
+        RemixIconFontSource(),
+    )
+
 
-ICON_FONT_SOURCES_BY_ID: dict[str, IconFontSource] = {
-    source.identifier: source for source in ICON_FONT_SOURCES
-}
+@functools.lru_cache(maxsize=1)
+def get_icon_font_sources_by_id() -> Mapping[str, IconFontSource]:
+    return MappingProxyType({source.identifier: source for source in get_icon_font_sources()})
 
-ICON_FONTS: tuple[IconFont, ...] = tuple(
-    font for source in ICON_FONT_SOURCES for font in source.fonts
+
+@functools.lru_cache(maxsize=1)
+def get_icon_fonts() -> tuple[IconFont, ...]:
+    return tuple(font for source in get_icon_font_sources() for font in source.fonts)
+
+
+@functools.lru_cache(maxsize=1)
+def get_icon_fonts_by_id() -> Mapping[str, IconFont]:
+    return MappingProxyType({font.identifier: font for font in get_icon_fonts()})
+
+
+_LAZY_CONSTANTS: Mapping[str, Callable[[], object]] = MappingProxyType(
+    {
+        "ICON_FONT_SOURCES": get_icon_font_sources,
+        "ICON_FONT_SOURCES_BY_ID": get_icon_font_sources_by_id,
+        "ICON_FONTS": get_icon_fonts,
+        "ICON_FONTS_BY_ID": get_icon_fonts_by_id,
+    }
 )
 
-ICON_FONTS_BY_ID: dict[str, IconFont] = {font.identifier: font for font in ICON_FONTS}
+
+def __getattr__(name: str) -> object:
+    # Keeps the former module constants importable; they resolve on first access.
+    factory = _LAZY_CONSTANTS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
 
 def ordered_fonts(font_ids: list[str] | None = None) -> list[IconFont]:
     if not font_ids:
-        return list(ICON_FONTS)
-    return [
-        ICON_FONTS_BY_ID[identifier] for identifier in font_ids if identifier in ICON_FONTS_BY_ID
-    ]
+        return list(get_icon_fonts())
+    return list(_ordered_fonts(tuple(font_ids)))
+
+
+@functools.lru_cache(maxsize=32)
+def _ordered_fonts(font_ids: tuple[str, ...]) -> tuple[IconFont, ...]:
+    fonts_by_id = get_icon_fonts_by_id()
+    return tuple(fonts_by_id[identifier] for identifier in font_ids if identifier in fonts_by_id)
@@ -2,12 +2,45 @@
 
 from __future__ import annotations
 
+import heapq
+import json
+import mmap
 import os
+import pickle
+import re
+import sys
+import threading
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
+from typing import BinaryIO, Callable
 
-from icon_fonts import ICON_FONT_SOURCES, ICON_FONTS, IconFont, IconFontSource
+from icon_fonts import (
+    CodepointsNotModified,
+    IconFont,
+    IconFontSource,
+    get_icon_font_sources,
+    get_icon_fonts,
+)
+
+_MAX_FETCH_WORKERS = 8
+# Bump when IconGlyph or the parsing rules change so stale glyph pickles are ignored.
+_GLYPH_PICKLE_VERSION = 3
+_GLYPH_NAME = attrgetter("name")
+_GLYPH_PICKLE_ERRORS = (
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+    TypeError,
+    ValueError,
+)
+
+# One "<name> <hex codepoint>" entry per line; comments and malformed lines never match.
+_CODEPOINT_LINE = re.compile(rb"^[ \t]*([^\s#]\S*)[ \t]+([0-9A-Fa-f]+)[ \t]*\r?$", re.MULTILINE)
 
 
 class IconRepositoryError(RuntimeError):
@@ -20,15 +53,38 @@ class IconDownloadError(IconRepositoryError):
 
 @dataclass
 class IconGlyph:
+    # Explicit slots (dataclass(slots=True) needs 3.10) drop the per-glyph __dict__.
+    __slots__ = (
+        "font_id",
+        "font_family",
+        "font_label",
+        "name",
+        "label",
+        "codepoint",
+        "character",
+        "search_target",
+    )
+
     font_id: str
     font_family: str
     font_label: str
     name: str
+    label: str
     codepoint: str
     character: str
     search_target: str
 
 
+def _filter_glyphs(glyphs: list[IconGlyph], tokens: Sequence[str]) -> list[IconGlyph]:
+    """Return glyphs whose search target contains every token, keeping their (name) order."""
+    pool = glyphs
+    # One comprehension per token beats an all() generator per glyph; longer tokens
+    # tend to be more selective, so they shrink the pool first.
+    for token in sorted(tokens, key=len, reverse=True):
+        pool = [glyph for glyph in pool if token in glyph.search_target]
+    return pool
+
+
 def resolve_cache_dir(cache_dir: Path | None = None) -> Path:
     if cache_dir is None:
         cache_home = os.environ.get("KICAD_CACHE_HOME")
@@ -45,6 +101,20 @@ def resolve_cache_dir(cache_dir: Path | None = None) -> Path:
     return resolved_cache_dir
 
 
+def _write_sidecar(path: Path, payload: bytes | Callable[[BinaryIO], object]) -> None:
+    """Atomically write a derived cache file; failures only cost a re-parse next time."""
+    partial = path.with_name(f"{path.name}.partial")
+    try:
+        with partial.open("wb") as stream:
+            if isinstance(payload, bytes):
+                stream.write(payload)
+            else:
+                payload(stream)
+        os.replace(partial, path)
+    except OSError:
+        partial.unlink(missing_ok=True)
+
+
 class IconRepository:
     def __init__(
         self,
@@ -54,78 +124,184 @@ class IconRepository:
     ) -> None:
         resolved_cache_dir = resolve_cache_dir(cache_dir)
         self.cache_dir = resolved_cache_dir
-        resolved_sources = font_sources or ICON_FONT_SOURCES
+        resolved_sources = font_sources or get_icon_font_sources()
         self.sources: dict[str, IconFontSource] = {
             source.identifier: source for source in resolved_sources
         }
-        resolved_fonts = fonts or ICON_FONTS
+        resolved_fonts = fonts or get_icon_fonts()
         self.fonts = {font.identifier: font for font in resolved_fonts}
+        self._cache_paths = {
+            identifier: self._build_cache_path(identifier) for identifier in self.fonts
+        }
         self._glyph_cache: dict[str, list[IconGlyph]] = {}
+        # Serializes downloads and cache file writes per font; different fonts load in parallel.
+        self._font_locks: dict[str, threading.RLock] = {
+            identifier: threading.RLock() for identifier in self.fonts
+        }
 
     def _cache_path(self, font: IconFont) -> Path:
-        safe_identifier = font.identifier.replace("/", "_")
+        cache_path = self._cache_paths.get(font.identifier)
+        if cache_path is None:
+            cache_path = self._build_cache_path(font.identifier)
+        return cache_path
+
+    def _build_cache_path(self, identifier: str) -> Path:
+        safe_identifier = identifier.replace("/", "_")
         return self.cache_dir / f"{safe_identifier}.codepoints"
 
+    def _font_lock(self, font: IconFont) -> threading.RLock:
+        lock = self._font_locks.get(font.identifier)
+        if lock is None:
+            lock = self._font_locks.setdefault(font.identifier, threading.RLock())
+        return lock
+
     def _download(self, font: IconFont, destination: Path) -> None:
-        source = self.sources.get(font.source_id)
-        if source is None:
-            raise IconDownloadError(
-                f"No font source registered for {font.identifier} ({font.source_id})"
-            )
-        try:
-            source.download_codepoints(font, destination)
-        except IconDownloadError:
-            raise
-        except IconRepositoryError:
-            raise
-        except Exception as exc:  # pragma: no cover - provider specific failure
-            raise IconDownloadError(
-                f"Unable to download codepoints for {font.identifier}: {exc}"
-            ) from exc
-
-    def _parse_codepoints(self, data: str, font: IconFont) -> list[IconGlyph]:
+        with self._font_lock(font):
+            source = self.sources.get(font.source_id)
+            if source is None:
+                raise IconDownloadError(
+                    f"No font source registered for {font.identifier} ({font.source_id})"
+                )
+            etag_path = destination.with_name(f"{destination.name}.etag")
+            etag = None
+            if destination.exists():
+                try:
+                    etag = etag_path.read_text(encoding="utf-8").strip() or None
+                except OSError:
+                    etag = None
+            try:
+                new_etag = source.download_codepoints(font, destination, etag=etag)
+            except CodepointsNotModified:
+                # Unchanged upstream: keep the cached file (and its glyph pickle) untouched.
+                return
+            except IconDownloadError:
+                raise
+            except IconRepositoryError:
+                raise
+            except Exception as exc:  # pragma: no cover - provider specific failure
+                raise IconDownloadError(
+                    f"Unable to download codepoints for {font.identifier}: {exc}"
+                ) from exc
+            if new_etag:
+                _write_sidecar(etag_path, new_etag.encode("utf-8"))
+            else:
+                etag_path.unlink(missing_ok=True)
+
+    def _parse_codepoints(self, data: bytes | mmap.mmap, font: IconFont) -> list[IconGlyph]:
+        # Interned so every glyph, and every reload of the font, shares one string object.
+        font_id = sys.intern(font.identifier)
+        font_family = sys.intern(font.font_family)
+        font_label = sys.intern(f"{font.display_name} {font.style_label}")
+        search_suffix = f" {font.style_label} {font.display_name}".lower()
         glyphs: list[IconGlyph] = []
-        for line in data.splitlines():
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            parts = stripped.split()
-            if len(parts) != 2:
-                continue
-            name, codepoint = parts
-            character = chr(int(codepoint, 16))
-            search_target = " ".join(
-                [name.replace("_", " "), font.style_label, font.display_name]
-            ).lower()
-            glyphs.append(
+        append = glyphs.append
+        # Only the captured fields are decoded, and the character comes straight from the
+        # ASCII hex bytes. Positional arguments follow IconGlyph's field order; keyword
+        # arguments cost noticeably more per glyph.
+        for raw_name, raw_codepoint in _CODEPOINT_LINE.findall(data):
+            name = raw_name.decode("utf-8")
+            label = name.replace("_", " ")
+            append(
                 IconGlyph(
-                    font_id=font.identifier,
-                    font_family=font.font_family,
-                    font_label=f"{font.display_name} {font.style_label}",
-                    name=name,
-                    codepoint=codepoint,
-                    character=character,
-                    search_target=search_target,
+                    font_id,
+                    font_family,
+                    font_label,
+                    name,
+                    label,
+                    raw_codepoint.decode("ascii"),
+                    chr(int(raw_codepoint, 16)),
+                    label.lower() + search_suffix,
                 )
             )
+        # Glyph lists stay sorted by name so searches never need to re-sort them.
+        glyphs.sort(key=_GLYPH_NAME)
         return glyphs
 
     def _load_glyphs(self, font: IconFont, force_refresh: bool = False) -> list[IconGlyph]:
-        if not force_refresh and font.identifier in self._glyph_cache:
-            return self._glyph_cache[font.identifier]
+        if not force_refresh:
+            glyphs = self._glyph_cache.get(font.identifier)
+            if glyphs is not None:
+                return glyphs
 
-        cache_path = self._cache_path(font)
-        if force_refresh or not cache_path.exists():
-            self._download(font, cache_path)
+        with self._font_lock(font):
+            if not force_refresh:
+                # Another thread may have loaded the font while this one waited for the lock.
+                glyphs = self._glyph_cache.get(font.identifier)
+                if glyphs is not None:
+                    return glyphs
+            cache_path = self._cache_path(font)
+            if force_refresh or not cache_path.exists():
+                self._download(font, cache_path)
+
+            glyphs = self._read_glyphs(font, cache_path)
+            self._glyph_cache[font.identifier] = glyphs
+            return glyphs
 
-        data = cache_path.read_text(encoding="utf-8")
-        glyphs = self._parse_codepoints(data, font)
-        self._glyph_cache[font.identifier] = glyphs
+    def _read_glyphs(self, font: IconFont, cache_path: Path) -> list[IconGlyph]:
+        """Load glyphs from the pickle beside the codepoints file unless it is stale."""
+        pickle_path = cache_path.with_name(f"{cache_path.name}.pkl")
+        key = self._glyph_cache_key(font, cache_path)
+        try:
+            with pickle_path.open("rb") as stream:
+                stored_key, glyphs = pickle.load(stream)
+            if stored_key == key:
+                return glyphs
+        except _GLYPH_PICKLE_ERRORS:
+            pass
+
+        with cache_path.open("rb") as stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                glyphs = []  # mmap cannot map empty files
+            else:
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    glyphs = self._parse_codepoints(data, font)
+        _write_sidecar(
+            pickle_path,
+            lambda stream: pickle.dump((key, glyphs), stream, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        count_payload = json.dumps({"key": key, "count": len(glyphs)}).encode("utf-8")
+        _write_sidecar(cache_path.with_name(f"{cache_path.name}.count"), count_payload)
         return glyphs
 
+    def _read_glyph_count(self, font: IconFont, cache_path: Path) -> int | None:
+        """Return the glyph count recorded for the current codepoints file, if any."""
+        count_path = cache_path.with_name(f"{cache_path.name}.count")
+        try:
+            stored = json.loads(count_path.read_bytes())
+            if stored["key"] == list(self._glyph_cache_key(font, cache_path)):
+                return int(stored["count"])
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return None
+
+    @staticmethod
+    def _glyph_cache_key(font: IconFont, cache_path: Path) -> tuple[object, ...]:
+        stat = cache_path.stat()
+        # Replacing the codepoints file changes its inode, so a refresh within the same
+        # mtime tick still invalidates derived caches.
+        return (
+            _GLYPH_PICKLE_VERSION,
+            font.identifier,
+            font.font_family,
+            font.display_name,
+            font.style_label,
+            stat.st_ino,
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+
     def ensure_fonts(self, refresh: bool = False) -> None:
-        for font in self.fonts.values():
-            self._load_glyphs(font, force_refresh=refresh)
+        pending = [
+            font
+            for font in self.fonts.values()
+            if refresh or font.identifier not in self._glyph_cache
+        ]
+        if not pending:
+            return
+        # Codepoint downloads are network-bound; fetch them concurrently.
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(pending))) as executor:
+            for _ in executor.map(lambda font: self._load_glyphs(font, refresh), pending):
+                pass
 
     def ensure_font(self, font_id: str, refresh: bool = False) -> bool:
         font = self.fonts.get(font_id)
@@ -137,6 +313,17 @@ class IconRepository:
             return False
         return True
 
+    def ensure_fonts_by_id(self, font_ids: Sequence[str]) -> dict[str, bool]:
+        """Run ensure_font for each id, fetching fonts that are not loaded yet concurrently."""
+        results = {font_id: True for font_id in font_ids if font_id in self._glyph_cache}
+        pending = [font_id for font_id in font_ids if font_id not in results]
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(pending))) as executor:
+                results.update(zip(pending, executor.map(self.ensure_font, pending)))
+        else:
+            results.update((font_id, self.ensure_font(font_id)) for font_id in pending)
+        return results
+
     def get_glyphs(self, font_ids: Iterable[str]) -> list[IconGlyph]:
         glyphs: list[IconGlyph] = []
         for font_id in font_ids:
@@ -159,30 +346,44 @@ class IconRepository:
         return cache_path.exists()
 
     def cached_glyph_count(self, font_id: str) -> int:
+        return self.font_cache_summary(font_id)[1]
+
+    def font_cache_summary(self, font_id: str) -> tuple[bool, int]:
+        """Return whether codepoints for the font are cached on disk and their glyph count."""
         font = self.fonts.get(font_id)
         if font is None:
-            return 0
-        cached_rows = self._glyph_cache.get(font.identifier)
-        if cached_rows is not None:
-            return len(cached_rows)
+            return False, 0
         cache_path = self._cache_path(font)
+        # The file on disk decides the cached flag; glyphs kept in memory only skip the parse.
         if not cache_path.exists():
-            return 0
+            return False, 0
+        cached_rows = self._glyph_cache.get(font.identifier)
+        if cached_rows is not None:
+            return True, len(cached_rows)
         try:
-            data = cache_path.read_text(encoding="utf-8")
+            count = self._read_glyph_count(font, cache_path)
+            if count is not None:
+                return True, count
+            with self._font_lock(font):
+                glyphs = self._glyph_cache.get(font.identifier)
+                if glyphs is None:
+                    glyphs = self._read_glyphs(font, cache_path)
+                    self._glyph_cache[font.identifier] = glyphs
+        except FileNotFoundError:
+            return False, 0
         except OSError:
-            return 0
-        glyphs = self._parse_codepoints(data, font)
-        self._glyph_cache[font.identifier] = glyphs
-        return len(glyphs)
+            return True, 0
+        return True, len(glyphs)
 
     def search(self, font_ids: Iterable[str], query: str) -> list[IconGlyph]:
-        glyphs = self.get_glyphs(font_ids)
         tokens = [token for token in query.lower().split() if token]
-        if not tokens:
-            return sorted(glyphs, key=lambda item: item.name)
-        filtered: list[IconGlyph] = []
-        for glyph in glyphs:
-            if all(token in glyph.search_target for token in tokens):
-                filtered.append(glyph)
-        return sorted(filtered, key=lambda item: item.name)
+        per_font: list[list[IconGlyph]] = []
+        for font_id in font_ids:
+            font = self.fonts.get(font_id)
+            if not font:
+                continue
+            per_font.append(_filter_glyphs(self._load_glyphs(font), tokens))
+        if len(per_font) == 1:
+            return list(per_font[0])
+        # Each font's matches are already sorted by name; merging keeps the order stable.
+        return list(heapq.merge(*per_font, key=_GLYPH_NAME))
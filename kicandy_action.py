@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import functools
+import os
 import weakref
+from collections import OrderedDict
 from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import Protocol, overload
 
 import wx
 from kipy import KiCad
@@ -12,7 +15,13 @@ from kipy.board import BoardLayerClass
 from kipy.board_types import BoardLayer, BoardText
 from kipy.geometry import Vector2
 
-from font_management import FontManager, fonts_pending_restart
+import settings
+from font_management import (
+    FontManager,
+    detect_missing_families,
+    fonts_pending_restart,
+    resolve_font_detection_cache,
+)
 from icon_fonts import BOLD_FONT_WEIGHT, IconFont
 from icon_repository import IconDownloadError, IconGlyph, IconRepository, resolve_cache_dir
 from state_store import PluginState
@@ -25,9 +34,18 @@ LAYER_CHOICES = [
 ]
 
 STATE_PATH = resolve_cache_dir() / "kicandy_state.json"
+FONT_DETECTION_CACHE_PATH = resolve_font_detection_cache()
 PROFILE_TXT_OUTPUT_PATH = Path("/tmp/kicandy_profile.txt")
 PROFILE_HTML_OUTPUT_PATH = Path("/tmp/kicandy_profile.html")
+PROFILE_ENV_VAR = "KICANDY_PROFILE"
 _WX_APP: wx.App | None = None
+_ROW_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _get_repository() -> IconRepository:
+    """Share one repository and its loaded glyphs across dialog opens."""
+    return IconRepository()
 
 
 @dataclass
@@ -40,16 +58,22 @@ class FontDetectionResult:
 def _detect_available_fonts(
     repository: IconRepository, fonts: Sequence[IconFont]
 ) -> FontDetectionResult:
-    enumerator = wx.FontEnumerator()
+    missing_families = detect_missing_families(
+        [font.font_family for font in fonts], FONT_DETECTION_CACHE_PATH
+    )
+    # Codepoints for every font wx can render are loaded concurrently, not one by one.
+    loaded = repository.ensure_fonts_by_id(
+        [font.identifier for font in fonts if font.font_family not in missing_families]
+    )
     offered: list[IconFont] = []
     missing: list[str] = []
     failed: list[str] = []
     for font in fonts:
         label = f"{font.display_name} {font.style_label}"
-        if not enumerator.IsValidFacename(font.font_family):
+        if font.font_family in missing_families:
             missing.append(label)
             continue
-        if not repository.ensure_font(font.identifier):
+        if not loaded[font.identifier]:
             failed.append(label)
             continue
         offered.append(font)
@@ -60,6 +84,45 @@ def _detect_available_fonts(
     )
 
 
+def _font_choices(fonts: Sequence[IconFont]) -> tuple[tuple[str, str], ...]:
+    return tuple((font.identifier, font.choice_label) for font in fonts)
+
+
+class _GlyphRows(Sequence[IconListRow]):
+    """Present glyphs as grid rows, building each row only when the grid asks for it."""
+
+    def __init__(self, glyphs: Sequence[IconGlyph]) -> None:
+        self._glyphs = glyphs
+        # Filled in as cells are drawn, so repaints and scrolling back reuse the same row.
+        self._rows: list[IconListRow | None] = [None] * len(glyphs)
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    @overload
+    def __getitem__(self, index: int) -> IconListRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[IconListRow]: ...
+
+    def __getitem__(self, index: int | slice) -> IconListRow | list[IconListRow]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self._glyphs)))]
+        row = self._rows[index]
+        if row is None:
+            glyph = self._glyphs[index]
+            row = IconListRow(
+                font_id=glyph.font_id,
+                glyph=glyph.character,
+                name=glyph.label,
+                font_label=glyph.font_label,
+                font_family=glyph.font_family,
+                payload=glyph,
+            )
+            self._rows[index] = row
+        return row
+
+
 class _Profiler(Protocol):
     def start(self) -> None: ...
 
@@ -72,14 +135,11 @@ class _Profiler(Protocol):
 
 class KicandyDialog(IconPickerDialog):
     def __init__(self) -> None:
-        repository = IconRepository()
+        repository = _get_repository()
         self.state = PluginState(STATE_PATH)
         self.font_manager = FontManager(repository, self.state)
         detection = _detect_available_fonts(repository, self.font_manager.available_fonts())
-        font_choices = [
-            (font.identifier, f"{font.display_name} ({font.style_label})")
-            for font in detection.offered_fonts
-        ]
+        font_choices = _font_choices(detection.offered_fonts)
         font_weights = {font.identifier: font.available_weights for font in detection.offered_fonts}
 
         super().__init__(
@@ -95,14 +155,27 @@ class KicandyDialog(IconPickerDialog):
         self._font_detection = detection
         self._offered_font_ids = [font.identifier for font in detection.offered_fonts]
         self._last_download_failed = False
+        self._row_cache: OrderedDict[tuple[frozenset[str], tuple[str, ...]], _GlyphRows] = (
+            OrderedDict()
+        )
         self._disconnect_handled = False
+        self._search_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_search_timer, self._search_timer)
         self._register_disconnect_handler()
 
         self._restore_state()
-        # Initial refresh runs via the search control's EVT_TEXT fired during _restore_state.
+        # _restore_state's SetValue queues a debounced refresh; show the icons right away instead.
+        self._search_timer.Stop()
+        self._refresh_icons()
 
     # --- Event hooks --------------------------------------------------------
     def on_search_changed(self, _: str) -> None:
+        # Restart on every keystroke so typing a word costs one search, not one per character.
+        self._search_timer.StartOnce(settings.SEARCH_DEBOUNCE_MS)
+
+    def on_search_submitted(self, _: str) -> None:
+        # Enter asks for results now; drop the pending debounced search.
+        self._search_timer.Stop()
         self._refresh_icons()
 
     def on_font_toggled(self, _: str, __: bool) -> None:
@@ -121,12 +194,15 @@ class KicandyDialog(IconPickerDialog):
         self._open_manage_dialog()
 
     # --- Internal helpers ---------------------------------------------------
+    def _on_search_timer(self, _: wx.TimerEvent) -> None:
+        if self._disconnect_handled:
+            return
+        self._refresh_icons()
+
     def _restore_state(self) -> None:
         self.set_font_weight(self.state.model.font_weight)
         self.set_search_text(self.state.model.search)
-        for font_id in self._offered_font_ids:
-            enabled = self.state.model.enabled_fonts.get(font_id, True)
-            self.set_font_selected(font_id, enabled)
+        self._restore_font_selection()
         self.set_layer_value(self.state.model.layer)
         if self.layer_choice.GetSelection() == wx.NOT_FOUND and self.layer_choice.GetCount() > 0:
             self.layer_choice.SetSelection(0)
@@ -168,28 +244,31 @@ class KicandyDialog(IconPickerDialog):
             self.set_status("Enable at least one icon set to browse icons")
             return
 
+        query = self.search_ctrl.GetValue()
+        # Keyed the way IconRepository.search normalizes the query, so "Arrow " hits "arrow".
+        cache_key = (frozenset(enabled_fonts), tuple(query.lower().split()))
+        rows = self._row_cache.get(cache_key)
+        if rows is not None:
+            self._row_cache.move_to_end(cache_key)
+            self.set_rows(rows)
+            return
+
         try:
-            glyphs = self.repository.search(enabled_fonts, self.search_ctrl.GetValue())
+            glyphs = self.repository.search(enabled_fonts, query)
             self._last_download_failed = False
         except IconDownloadError as exc:
             if not self._last_download_failed:
                 wx.MessageBox(str(exc), "Icon download failed", parent=self)
             self._last_download_failed = True
+            self._row_cache.clear()
             self.set_rows([])
             self.set_status("Unable to load icon metadata. Check network access.")
             return
 
-        rows = [
-            IconListRow(
-                font_id=glyph.font_id,
-                glyph=glyph.character,
-                name=glyph.name.replace("_", " "),
-                font_label=glyph.font_label,
-                font_family=glyph.font_family,
-                payload=glyph,
-            )
-            for glyph in glyphs
-        ]
+        rows = _GlyphRows(glyphs)
+        self._row_cache[cache_key] = rows
+        if len(self._row_cache) > _ROW_CACHE_SIZE:
+            self._row_cache.popitem(last=False)
         self.set_rows(rows)
 
     def _open_manage_dialog(self) -> None:
@@ -248,21 +327,21 @@ class KicandyDialog(IconPickerDialog):
 
     def _reload_font_detection(self) -> None:
         detection = _detect_available_fonts(self.repository, self.font_manager.available_fonts())
+        # Detection may have reloaded glyph metadata, so cached rows could be stale.
+        self._row_cache.clear()
         self._font_detection = detection
         self._offered_font_ids = [font.identifier for font in detection.offered_fonts]
-        font_choices = [
-            (font.identifier, f"{font.display_name} ({font.style_label})")
-            for font in detection.offered_fonts
-        ]
+        font_choices = _font_choices(detection.offered_fonts)
         font_weights = {font.identifier: font.available_weights for font in detection.offered_fonts}
         self.reset_fonts(font_choices, font_weights)
         self._restore_font_selection()
         self._update_weight_availability()
 
     def _restore_font_selection(self) -> None:
-        for font_id in self._offered_font_ids:
-            enabled = self.state.model.enabled_fonts.get(font_id, True)
-            self.set_font_selected(font_id, enabled)
+        enabled_fonts = self.state.model.enabled_fonts
+        self.set_fonts_selected(
+            {font_id: enabled_fonts.get(font_id, True) for font_id in self._offered_font_ids}
+        )
 
     def set_status(self, message: str) -> None:  # type: ignore[override]
         if fonts_pending_restart():
@@ -303,6 +382,7 @@ class KicandyDialog(IconPickerDialog):
 
     def EndModal(self, ret_code: int) -> None:  # type: ignore[override]
         self._disconnect_handled = True
+        self._search_timer.Stop()
         super().EndModal(ret_code)
 
     def _register_disconnect_handler(self) -> None:
@@ -310,15 +390,13 @@ class KicandyDialog(IconPickerDialog):
         if not callable(on_disconnect):
             return
 
-        dialog_ref = weakref.ref(self)
+        # KiCad may outlive the dialog, so it only holds a weak reference to the handler.
+        handler_ref = weakref.WeakMethod(self._handle_kicad_disconnect)
 
         def _handle_disconnect_callback() -> None:
-            dialog = dialog_ref()
-            if dialog is None:
-                return
-            if hasattr(dialog, "IsBeingDeleted") and dialog.IsBeingDeleted():
-                return
-            wx.CallAfter(dialog._handle_kicad_disconnect)
+            handler = handler_ref()
+            if handler is not None:
+                wx.CallAfter(handler)
 
         try:
             on_disconnect(_handle_disconnect_callback)
@@ -331,6 +409,7 @@ class KicandyDialog(IconPickerDialog):
         if hasattr(self, "IsBeingDeleted") and self.IsBeingDeleted():
             return
         self._disconnect_handled = True
+        self._search_timer.Stop()
         self.set_status("Lost connection to KiCad; closing")
         self._persist_state()
         self.EndModal(wx.ID_CANCEL)
@@ -360,6 +439,9 @@ def main() -> None:
 
 
 def _start_profiler() -> _Profiler | None:
+    # Opt-in: skips the pyinstrument import and the /tmp report writes on normal launches.
+    if os.environ.get(PROFILE_ENV_VAR) != "1":
+        return None
     try:
         from pyinstrument import Profiler
     except ModuleNotFoundError:
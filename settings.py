@@ -2,3 +2,5 @@ FONT_SIZE_MIN_MM = 3
 FONT_SIZE_MAX_MM = 20
 DEFAULT_FONT_SIZE_MM = 5
 ICON_GRID_MIN_CELL_PX = 64
+SEARCH_DEBOUNCE_MS = 120
+ICON_GRID_RESIZE_SETTLE_MS = 30
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import json
+import os
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from kipy.board_types import BoardLayer
 
 import settings
-from icon_fonts import DEFAULT_FONT_WEIGHT, FONT_WEIGHT_NAMES, ICON_FONTS
+from icon_fonts import DEFAULT_FONT_WEIGHT, FONT_WEIGHT_NAMES, get_icon_fonts
 
 
 @dataclass
@@ -17,26 +19,30 @@ class DialogState:
     search: str = ""
     layer: int = BoardLayer.BL_F_SilkS
     enabled_fonts: dict[str, bool] = field(
-        default_factory=lambda: {font.identifier: font.default_enabled for font in ICON_FONTS}
+        default_factory=lambda: {font.identifier: font.default_enabled for font in get_icon_fonts()}
     )
     font_size_mm: int = settings.DEFAULT_FONT_SIZE_MM
     font_weight: str = DEFAULT_FONT_WEIGHT
-    deleted_fonts: set[str] = field(default_factory=set)
+    deleted_fonts: frozenset[str] = frozenset()
 
 
 class PluginState:
     def __init__(self, path: Path) -> None:
         self.path = path
         self.model = DialogState()
+        # Text last read from or written to path; save() skips writing it again.
+        self._saved_text: str | None = None
         self.load()
 
     def load(self) -> None:
         if not self.path.exists():
             return
         try:
-            data = json.loads(self.path.read_text())
+            text = self.path.read_text(encoding="utf-8")
+            data = json.loads(text)
         except (OSError, json.JSONDecodeError):
             return
+        self._saved_text = text
 
         self.model.search = data.get("search", "")
         layer_value = data.get("layer")
@@ -62,11 +68,10 @@ class PluginState:
 
         stored_deleted = data.get("deleted_fonts")
         if isinstance(stored_deleted, list):
-            valid = {value for value in stored_deleted if isinstance(value, str)}
+            valid = frozenset(value for value in stored_deleted if isinstance(value, str))
             self.model.deleted_fonts = valid
 
     def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "search": self.model.search,
             "layer": self.model.layer,
@@ -75,7 +80,19 @@ class PluginState:
             "font_weight": self.model.font_weight,
             "deleted_fonts": sorted(self.model.deleted_fonts),
         }
-        self.path.write_text(json.dumps(payload, indent=2))
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        if text == self._saved_text:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Written beside the target and renamed over it, so a crash never leaves half a file.
+        partial = self.path.with_name(f"{self.path.name}.partial")
+        try:
+            partial.write_text(text, encoding="utf-8")
+            os.replace(partial, self.path)
+        except OSError:
+            partial.unlink(missing_ok=True)
+            raise
+        self._saved_text = text
 
     def update(
         self,
@@ -85,7 +102,7 @@ class PluginState:
         enabled_fonts: dict[str, bool],
         font_size_mm: int,
         font_weight: str,
-        deleted_fonts: set[str] | None = None,
+        deleted_fonts: AbstractSet[str] | None = None,
     ) -> None:
         self.model.search = search
         self.model.layer = layer
@@ -100,9 +117,9 @@ class PluginState:
         else:
             self.model.font_weight = DEFAULT_FONT_WEIGHT
         if deleted_fonts is not None:
-            self.model.deleted_fonts = set(deleted_fonts)
+            self.model.deleted_fonts = frozenset(deleted_fonts)
         self.save()
 
-    def update_deleted_fonts(self, deleted_fonts: set[str]) -> None:
-        self.model.deleted_fonts = set(deleted_fonts)
+    def update_deleted_fonts(self, deleted_fonts: AbstractSet[str]) -> None:
+        self.model.deleted_fonts = frozenset(deleted_fonts)
         self.save()
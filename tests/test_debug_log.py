@@ -0,0 +1,119 @@
+"""Tests for the buffered debug log handler."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+import debug_log
+from debug_log import _BufferedFileHandler
+
+
+@pytest.fixture
+def log_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    path = tmp_path / "kicandy.log"
+    monkeypatch.setattr(debug_log, "LOG_FILE", path)
+    monkeypatch.setattr(debug_log, "_logger", None)
+    logger = logging.getLogger("kicandy")
+    saved = (logger.level, logger.propagate, list(logger.handlers))
+    logger.handlers.clear()
+    yield path
+    for handler in logger.handlers:
+        handler.close()
+    logger.setLevel(saved[0])
+    logger.propagate = saved[1]
+    logger.handlers[:] = saved[2]
+
+
+def _record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("kicandy", level, __file__, 0, message, None, None)
+
+
+def test_buffered_handler_flushes_on_error(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    handler = _BufferedFileHandler(log_file, flush_interval=3600)
+    try:
+        handler.emit(_record(logging.INFO, "buffered"))
+        assert log_file.read_text(encoding="utf-8") == ""
+
+        handler.emit(_record(logging.ERROR, "failed"))
+        assert log_file.read_text(encoding="utf-8") == "buffered\nfailed\n"
+    finally:
+        handler.close()
+
+
+def test_buffered_handler_flushes_periodically(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    handler = _BufferedFileHandler(log_file, flush_interval=0.01)
+    try:
+        handler.emit(_record(logging.INFO, "buffered"))
+        deadline = time.monotonic() + 2
+        while not log_file.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log_file.read_text(encoding="utf-8") == "buffered\n"
+    finally:
+        handler.close()
+
+
+def test_close_stops_flush_thread(tmp_path: Path) -> None:
+    handler = _BufferedFileHandler(tmp_path / "debug.log", flush_interval=3600)
+    assert handler._flush_thread.is_alive()
+
+    handler.close()
+    handler._flush_thread.join(timeout=1)
+    assert not handler._flush_thread.is_alive()
+
+
+def test_logger_without_debug_env_never_creates_file(
+    log_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv(debug_log.DEBUG_ENV_VAR, raising=False)
+    logger = debug_log.get_logger()
+    logger.error("ignored")
+    assert not logger.isEnabledFor(logging.ERROR)
+    assert not log_file.exists()
+
+
+def test_logger_with_debug_env_writes_file(log_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(debug_log.DEBUG_ENV_VAR, "1")
+    logger = debug_log.get_logger()
+    assert debug_log.get_logger() is logger
+    logger.error("boom")
+    contents = log_file.read_text(encoding="utf-8")
+    assert "Debug logging initialized" in contents
+    assert "[ERROR] kicandy: boom" in contents
+
+
+def _probe(module: str) -> Callable[[], int]:
+    namespace: dict[str, object] = {"__name__": module}
+    exec("def probe():\n    return 1\n", namespace)  # noqa: S102 - synthesise a module frame
+    return namespace["probe"]  # type: ignore[return-value]
+
+
+def test_trace_query_matches_plugin_modules_only() -> None:
+    hunter = pytest.importorskip("hunter")
+    modules = ["ui", "ui.icon_picker", "uiautomation", "icon_fonts", "icon_fonts_extra"]
+    probes = [_probe(module) for module in modules]
+    seen: list[tuple[str, str]] = []
+
+    hunter.trace(
+        debug_log._trace_query(hunter), action=lambda event: seen.append((event.module, event.kind))
+    )
+    try:
+        for probe in probes:
+            probe()
+    finally:
+        hunter.stop()
+
+    assert seen == [
+        ("ui", "call"),
+        ("ui", "return"),
+        ("ui.icon_picker", "call"),
+        ("ui.icon_picker", "return"),
+        ("icon_fonts", "call"),
+        ("icon_fonts", "return"),
+    ]
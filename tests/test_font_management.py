@@ -0,0 +1,214 @@
+"""Tests for font install-state tracking in the font manager."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+import font_management
+from font_management import FontManager
+from icon_fonts import IconFont, IconFontFile
+from icon_repository import IconRepository
+from state_store import PluginState
+
+
+class StaticFontSource:
+    """Test helper that writes a fixed codepoints payload."""
+
+    identifier = "sample-source"
+
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
+        destination.write_text("bolt ea0b\n", encoding="utf-8")
+        return None
+
+
+@pytest.fixture
+def sample_font() -> IconFont:
+    return IconFont(
+        identifier="sample-icons",
+        source_id="sample-source",
+        display_name="Sample Icons",
+        style_label="Regular",
+        font_family="Sample Icons",
+        codepoints_resource="unused",
+        font_files=(
+            IconFontFile(url="https://example.com/fonts/SampleIcons%5Bwght%5D.ttf", format="ttf"),
+        ),
+    )
+
+
+@pytest.fixture
+def install_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    monkeypatch.setattr(font_management, "resolve_font_install_dir", lambda: directory)
+    return directory
+
+
+@pytest.fixture
+def manager(tmp_path: Path, sample_font: IconFont, install_dir: Path) -> FontManager:
+    repository = IconRepository(
+        cache_dir=tmp_path / "cache",
+        fonts=(sample_font,),
+        font_sources=(StaticFontSource(),),
+    )
+    state = PluginState(tmp_path / "state.json")
+    return FontManager(repository, state, fonts=(sample_font,))
+
+
+@pytest.fixture(autouse=True)
+def _restore_install_flags(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(font_management, "_NEW_FONTS_INSTALLED", False)
+    monkeypatch.setattr(
+        font_management, "_FONT_INSTALL_GENERATION", font_management._FONT_INSTALL_GENERATION
+    )
+
+
+def _installed(manager: FontManager) -> bool:
+    (row,) = manager.font_status_rows()
+    return row.is_installed
+
+
+class TestInstalledFontScan:
+    def test_scan_is_reused_until_fonts_change(
+        self,
+        manager: FontManager,
+        sample_font: IconFont,
+        install_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        def fake_install(fonts: Sequence[IconFont], **_: object) -> bool:
+            for font in fonts:
+                for font_file in font.ttf_files:
+                    (install_dir / font_file.filename).write_bytes(b"font")
+            return True
+
+        monkeypatch.setattr(font_management, "install_font_files", fake_install)
+
+        assert not _installed(manager)
+        # Files appearing behind the manager's back are not seen until fonts change.
+        (install_dir / "SampleIcons%5Bwght%5D.ttf").write_bytes(b"font")
+        assert not _installed(manager)
+
+        manager.install_fonts([sample_font.identifier])
+        assert _installed(manager)
+
+    def test_uninstall_drops_scan(
+        self,
+        manager: FontManager,
+        sample_font: IconFont,
+        install_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        installed_file = install_dir / "SampleIcons%5Bwght%5D.ttf"
+        installed_file.write_bytes(b"font")
+
+        def fake_remove(fonts: Sequence[IconFont]) -> bool:
+            installed_file.unlink()
+            return True
+
+        monkeypatch.setattr(font_management, "remove_font_files", fake_remove)
+
+        assert _installed(manager)
+        assert manager.uninstall_fonts([sample_font.identifier]) == [sample_font.identifier]
+        assert not _installed(manager)
+        assert manager.deleted_fonts() == {sample_font.identifier}
+
+
+class FakeFontEnumerator:
+    calls = 0
+    facenames: list[str] = []
+
+    @classmethod
+    def GetFacenames(cls) -> list[str]:  # noqa: N802 - wx API
+        cls.calls += 1
+        return list(cls.facenames)
+
+
+class FakeWx:
+    FontEnumerator = FakeFontEnumerator
+
+
+class TestSystemFacenames:
+    def test_facenames_enumerated_once_per_install_generation(
+        self, manager: FontManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(font_management, "wx", FakeWx)
+        monkeypatch.setattr(FakeFontEnumerator, "calls", 0)
+        monkeypatch.setattr(FakeFontEnumerator, "facenames", ["Other Font"])
+
+        assert [row.wx_available for row in manager.font_status_rows()] == [False]
+        FakeFontEnumerator.facenames = ["SAMPLE ICONS"]
+        assert [row.wx_available for row in manager.font_status_rows()] == [False]
+        assert FakeFontEnumerator.calls == 1
+
+        font_management.mark_fonts_installed()
+        assert [row.wx_available for row in manager.font_status_rows()] == [True]
+        assert FakeFontEnumerator.calls == 2
+
+
+class TestInstalledDetection:
+    @pytest.mark.parametrize("filename", ["SampleIcons%5Bwght%5D.ttf", "SampleIcons[wght].ttf"])
+    def test_installed_matches_encoded_and_decoded_names(
+        self, manager: FontManager, install_dir: Path, filename: str
+    ) -> None:
+        (install_dir / filename).write_bytes(b"font")
+        (row,) = manager.font_status_rows()
+        assert row.is_installed
+        assert row.installable
+        assert row.uninstallable
+
+    def test_unrelated_files_do_not_count_as_installed(
+        self, manager: FontManager, sample_font: IconFont, install_dir: Path
+    ) -> None:
+        (install_dir / "SampleIcons.ttf").write_bytes(b"font")
+        (row,) = manager.font_status_rows()
+        assert not row.is_installed
+        assert not row.uninstallable
+        assert manager.uninstall_fonts([sample_font.identifier]) == []
+
+
+class TestFontDetectionCache:
+    @pytest.fixture(autouse=True)
+    def _fake_wx(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(font_management, "wx", FakeWx)
+        monkeypatch.setattr(FakeFontEnumerator, "calls", 0)
+        monkeypatch.setattr(FakeFontEnumerator, "facenames", ["SAMPLE ICONS"])
+
+    def test_recent_result_is_reused(self, tmp_path: Path, install_dir: Path) -> None:
+        cache_path = tmp_path / "font_detection.json"
+        families = ["Sample Icons", "Other Icons"]
+
+        assert font_management.detect_missing_families(families, cache_path) == {"Other Icons"}
+        assert FakeFontEnumerator.calls == 1
+        assert font_management.detect_missing_families(families, cache_path) == {"Other Icons"}
+        assert FakeFontEnumerator.calls == 1
+
+    def test_cache_misses_when_families_or_install_dir_change(
+        self, tmp_path: Path, install_dir: Path
+    ) -> None:
+        cache_path = tmp_path / "font_detection.json"
+        font_management.detect_missing_families(["Sample Icons"], cache_path)
+        font_management.detect_missing_families(["Sample Icons", "Other Icons"], cache_path)
+        assert FakeFontEnumerator.calls == 2
+
+        stat = install_dir.stat()
+        os.utime(install_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        font_management.detect_missing_families(["Sample Icons", "Other Icons"], cache_path)
+        assert FakeFontEnumerator.calls == 3
+
+    def test_cache_expires(
+        self, tmp_path: Path, install_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache_path = tmp_path / "font_detection.json"
+        font_management.detect_missing_families(["Sample Icons"], cache_path)
+        now = time.time() + font_management.FONT_DETECTION_CACHE_TTL_S
+        monkeypatch.setattr(font_management.time, "time", lambda: now)
+        font_management.detect_missing_families(["Sample Icons"], cache_path)
+        assert FakeFontEnumerator.calls == 2
@@ -1,3 +1,10 @@
+import io
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -6,6 +13,7 @@ import icon_fonts
 from icon_fonts import (
     DEFAULT_FONT_WEIGHT,
     FONT_WEIGHT_NAMES,
+    IconFontFile,
     MaterialDesignIconsFontSource,
     RemixIconFontSource,
     resolve_weight_choice,
@@ -14,6 +22,43 @@ from icon_fonts import (
 )
 
 
+class _DownloadHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server hook
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/font.ttf")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = self.path.encode("utf-8") * 100
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+        return
+
+
+@pytest.fixture
+def local_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DownloadHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 def test_weight_position_round_trip() -> None:
     for index, name in enumerate(FONT_WEIGHT_NAMES, start=1):
         assert weight_position_for_name(name) == index
@@ -40,14 +85,36 @@ def test_resolve_weight_choice_handles_invalid_options() -> None:
     assert choice == "Medium"
 
 
+def test_icon_font_file_filename_matches_url_basename() -> None:
+    font_file = IconFontFile(url="https://example.com/fonts/Icons%5Bwght%5D.ttf", format="ttf")
+    assert font_file.filename == Path(font_file.url).name == "Icons%5Bwght%5D.ttf"
+
+
+def test_icon_font_ttf_filenames_include_decoded_variants() -> None:
+    font = icon_fonts.ICON_FONTS_BY_ID["material-symbols-outlined"]
+    assert [font_file.format for font_file in font.ttf_files] == ["ttf"]
+    assert font.ttf_filenames == {
+        "MaterialSymbolsOutlined%5BFILL,GRAD,opsz,wght%5D.ttf",
+        "MaterialSymbolsOutlined[FILL,GRAD,opsz,wght].ttf",
+    }
+    paths = icon_fonts.get_font_install_paths(font, Path("/fonts"))
+    assert {path.name for path in paths} == font.ttf_filenames
+
+
+def test_icon_font_choice_label() -> None:
+    font = icon_fonts.ICON_FONTS_BY_ID["material-symbols-outlined"]
+    assert font.choice_label == f"{font.display_name} (Outlined)"
+    assert "choice_label" not in repr(font)
+
+
 def test_material_design_icons_download_codepoints(
     tmp_path: Path, fixtures_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    metadata = (fixtures_path / "material_design_meta_sample.json").read_text(encoding="utf-8")
+    metadata = (fixtures_path / "material_design_meta_sample.json").read_bytes()
     source = MaterialDesignIconsFontSource()
     font = source.fonts[0]
 
-    monkeypatch.setattr(icon_fonts, "_download_text_resource", lambda url: metadata)
+    monkeypatch.setattr(icon_fonts, "_open_download", lambda url, etag=None: io.BytesIO(metadata))
 
     destination = tmp_path / "mdi.codepoints"
     source.download_codepoints(font, destination)
@@ -59,14 +126,37 @@ def test_material_design_icons_download_codepoints(
     ]
 
 
+def test_material_design_icons_failed_refresh_keeps_previous_cache(
+    tmp_path: Path, fixtures_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    metadata = (fixtures_path / "material_design_meta_sample.json").read_bytes()
+    source = MaterialDesignIconsFontSource()
+    font = source.fonts[0]
+    destination = tmp_path / "mdi.codepoints"
+    destination.write_text("abacus F16E0\n", encoding="utf-8")
+
+    # A stream cut off mid-array fails after some glyphs were already written.
+    truncated = metadata[: metadata.index(b'"abacus"')]
+    monkeypatch.setattr(icon_fonts, "_open_download", lambda url, etag=None: io.BytesIO(truncated))
+    with pytest.raises(RuntimeError):
+        source.download_codepoints(font, destination)
+
+    monkeypatch.setattr(icon_fonts, "_open_download", lambda url, etag=None: io.BytesIO(b"[]"))
+    with pytest.raises(RuntimeError):
+        source.download_codepoints(font, destination)
+
+    assert destination.read_text(encoding="utf-8") == "abacus F16E0\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["mdi.codepoints"]
+
+
 def test_remix_icon_download_codepoints(
     tmp_path: Path, fixtures_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    css = (fixtures_path / "remixicon_sample.css").read_text(encoding="utf-8")
+    css = (fixtures_path / "remixicon_sample.css").read_bytes()
     source = RemixIconFontSource()
     font = source.fonts[0]
 
-    monkeypatch.setattr(icon_fonts, "_download_text_resource", lambda url: css)
+    monkeypatch.setattr(icon_fonts, "_open_download", lambda url, etag=None: io.BytesIO(css))
 
     destination = tmp_path / "remix.codepoints"
     source.download_codepoints(font, destination)
@@ -79,3 +169,150 @@ def test_remix_icon_download_codepoints(
         "4k-line ea04",
         "a-b ea05",
     ]
+
+
+def test_copy_font_files_downloads_all_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fake_download(url: str, destination: Path) -> None:
+        destination.write_bytes(url.encode("utf-8"))
+
+    monkeypatch.setattr(icon_fonts, "_download_to_path", fake_download)
+    font = MaterialDesignIconsFontSource().fonts[0]
+    files = [
+        IconFontFile(url=f"https://example.com/fonts/Icons{index}.ttf", format="ttf")
+        for index in range(3)
+    ]
+    progress: list[tuple[int, int]] = []
+
+    destination = tmp_path / "fonts"
+    icon_fonts._copy_font_files(
+        [(font, font_file) for font_file in files],
+        destination,
+        progress_cb=lambda completed, total: progress.append((completed, total)),
+    )
+
+    for font_file in files:
+        assert (destination / font_file.filename).read_bytes() == font_file.url.encode("utf-8")
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert not list(destination.glob("*.partial"))
+
+
+def test_copy_font_files_stops_after_first_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+
+    def fake_download(url: str, destination: Path) -> None:
+        calls.append(url)
+        if url.endswith("Icons0.ttf"):
+            raise RuntimeError("boom")
+        # Keep the single worker busy so the failure is seen before the queue drains.
+        time.sleep(0.2)
+        destination.write_bytes(b"font")
+
+    monkeypatch.setattr(icon_fonts, "_download_to_path", fake_download)
+    monkeypatch.setattr(icon_fonts, "_MAX_DOWNLOAD_WORKERS", 1)
+    font = MaterialDesignIconsFontSource().fonts[0]
+    files = [
+        IconFontFile(url=f"https://example.com/fonts/Icons{index}.ttf", format="ttf")
+        for index in range(20)
+    ]
+    progress: list[tuple[int, int]] = []
+
+    destination = tmp_path / "fonts"
+    with pytest.raises(RuntimeError, match="boom"):
+        icon_fonts._copy_font_files(
+            [(font, font_file) for font_file in files],
+            destination,
+            progress_cb=lambda completed, total: progress.append((completed, total)),
+        )
+
+    assert len(calls) < len(files)
+    assert progress == []
+    assert not list(destination.glob("*.partial"))
+
+
+def test_windows_font_registry_changes_use_single_import(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[list[str], bool, bytes]] = []
+
+    def fake_run(args: list[str], check: bool) -> None:
+        calls.append((args, check, Path(args[2]).read_bytes()))
+
+    monkeypatch.setattr(icon_fonts.subprocess, "run", fake_run)
+    icon_fonts._register_windows_fonts(
+        [
+            ("Material Symbols Outlined", "MaterialSymbolsOutlined.ttf"),
+            ("Remix", "remix.ttf"),
+        ]
+    )
+    icon_fonts._unregister_windows_fonts(["Remix"])
+
+    assert [(args[:2], check) for args, check, _ in calls] == [
+        (["reg", "import"], True),
+        (["reg", "import"], False),
+    ]
+    register_payload = calls[0][2].decode("utf-16")
+    assert register_payload.splitlines() == [
+        "Windows Registry Editor Version 5.00",
+        "",
+        "[HKEY_CURRENT_USER\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Fonts]",
+        '"Material Symbols Outlined (TrueType)"="MaterialSymbolsOutlined.ttf"',
+        '"Remix (TrueType)"="remix.ttf"',
+    ]
+    assert "\r\n" in register_payload
+    assert '"Remix (TrueType)"=-' in calls[1][2].decode("utf-16")
+    assert not Path(calls[0][0][2]).exists()
+
+
+def test_downloads_stream_and_follow_redirects(local_server: str, tmp_path: Path) -> None:
+    icon_fonts._download_to_path(f"{local_server}/a.ttf", tmp_path / "a.ttf")
+    assert (tmp_path / "a.ttf").read_bytes() == b"/a.ttf" * 100
+    assert icon_fonts._download_bytes(f"{local_server}/redirect") == b"/font.ttf" * 100
+
+
+def test_ordered_fonts_keeps_requested_order() -> None:
+    font_ids = ["remix-icon-regular", "unknown", "material-symbols-sharp"]
+    fonts = icon_fonts.ordered_fonts(font_ids)
+    assert [font.identifier for font in fonts] == ["remix-icon-regular", "material-symbols-sharp"]
+    fonts.clear()
+    assert len(icon_fonts.ordered_fonts(font_ids)) == 2
+    assert icon_fonts.ordered_fonts() == list(icon_fonts.ICON_FONTS)
+
+
+def test_font_sources_are_built_on_first_use() -> None:
+    script = (
+        "import icon_fonts; "
+        "print(icon_fonts.get_icon_font_sources.cache_info().currsize); "
+        "icon_fonts.ICON_FONTS; "
+        "print(icon_fonts.get_icon_font_sources.cache_info().currsize)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(icon_fonts.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["0", "1"]
+
+
+def test_lazy_font_constants_match_accessors() -> None:
+    assert icon_fonts.ICON_FONTS is icon_fonts.get_icon_fonts()
+    assert icon_fonts.ICON_FONTS_BY_ID is icon_fonts.get_icon_fonts_by_id()
+    assert set(icon_fonts.ICON_FONT_SOURCES_BY_ID) == {
+        source.identifier for source in icon_fonts.ICON_FONT_SOURCES
+    }
+    with pytest.raises(AttributeError):
+        icon_fonts.NOT_A_CONSTANT  # noqa: B018 - attribute access under test
+
+
+def test_conditional_download_reports_unchanged_resource(local_server: str, tmp_path: Path) -> None:
+    destination = tmp_path / "a.codepoints"
+    assert icon_fonts._download_to_path(f"{local_server}/a", destination) == '"v1"'
+    with pytest.raises(icon_fonts.CodepointsNotModified):
+        icon_fonts._download_to_path(f"{local_server}/a", tmp_path / "b.codepoints", '"v1"')
+    assert icon_fonts._download_to_path(f"{local_server}/a", destination, '"v0"') == '"v1"'
+    assert not (tmp_path / "b.codepoints").exists()
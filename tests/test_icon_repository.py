@@ -2,25 +2,53 @@
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
-from icon_fonts import IconFont
-from icon_repository import IconRepository
+from icon_fonts import CodepointsNotModified, IconFont
+from icon_repository import IconGlyph, IconRepository
 
 
 class RecordingFontSource:
     """Test helper that records download attempts and writes fixture payloads."""
 
-    def __init__(self, identifier: str, payload: str) -> None:
+    def __init__(self, identifier: str, payload: str, etag: str | None = None) -> None:
         self.identifier = identifier
         self._payload = payload
+        self._etag = etag
         self.download_requests: list[str] = []
+        self.sent_etags: list[str | None] = []
 
-    def download_codepoints(self, font: IconFont, destination: Path) -> None:
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
         self.download_requests.append(font.identifier)
+        self.sent_etags.append(etag)
+        if etag is not None and etag == self._etag:
+            raise CodepointsNotModified(font.codepoints_resource)
         destination.write_text(self._payload, encoding="utf-8")
+        return self._etag
+
+
+class BlockingFontSource(RecordingFontSource):
+    """Test helper whose downloads wait until the test releases them."""
+
+    def __init__(self, identifier: str, payload: str) -> None:
+        super().__init__(identifier, payload)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def download_codepoints(
+        self, font: IconFont, destination: Path, etag: str | None = None
+    ) -> str | None:
+        self.started.set()
+        self.release.wait(timeout=5)
+        return super().download_codepoints(font, destination, etag)
 
 
 @pytest.fixture
@@ -75,6 +103,7 @@ class TestIconRepository:
         first = glyphs[0]
         assert first.font_id == sample_font.identifier
         assert first.character == chr(int("e951", 16))
+        assert not hasattr(first, "__dict__")
 
     def test_search_respects_query_tokens(
         self, repository: IconRepository, sample_font: IconFont
@@ -82,6 +111,35 @@ class TestIconRepository:
         matches = repository.search([sample_font.identifier], "outlined unit")
         assert [match.name for match in matches] == ["ac_unit"]
 
+    @pytest.mark.parametrize(
+        "query",
+        ["unit", "AC", "a", "10", "mp 10k", "symbols bolt", "outl", "zzz", "ac unit outlined"],
+    )
+    def test_search_matches_every_token(
+        self, repository: IconRepository, sample_font: IconFont, query: str
+    ) -> None:
+        glyphs = repository.get_glyphs([sample_font.identifier])
+        tokens = query.lower().split()
+        expected = sorted(
+            (glyph for glyph in glyphs if all(token in glyph.search_target for token in tokens)),
+            key=lambda item: item.name,
+        )
+        assert repository.search([sample_font.identifier], query) == expected
+
+    def test_search_follows_refreshed_glyphs(
+        self,
+        repository: IconRepository,
+        sample_font: IconFont,
+        recording_source: RecordingFontSource,
+    ) -> None:
+        assert [match.name for match in repository.search([sample_font.identifier], "bolt")] == [
+            "bolt"
+        ]
+        recording_source._payload = "bolt_alt ea0c\n"
+        assert repository.ensure_font(sample_font.identifier, refresh=True)
+        matches = repository.search([sample_font.identifier], "bolt")
+        assert [match.name for match in matches] == ["bolt_alt"]
+
     def test_empty_query_returns_all_sorted(
         self, repository: IconRepository, sample_font: IconFont
     ) -> None:
@@ -94,6 +152,24 @@ class TestIconRepository:
             "bolt",
         ]
 
+    def test_search_merges_fonts_by_name(
+        self, tmp_path: Path, sample_font: IconFont, recording_source: RecordingFontSource
+    ) -> None:
+        other_font = replace(sample_font, identifier="material-symbols-other")
+        repository = IconRepository(
+            cache_dir=tmp_path,
+            fonts=(sample_font, other_font),
+            font_sources=(recording_source,),
+        )
+        font_ids = [other_font.identifier, sample_font.identifier]
+        for query in ("", "1"):
+            matches = repository.search(font_ids, query)
+            expected = sorted(repository.get_glyphs(font_ids), key=lambda item: item.name)
+            if query:
+                expected = [glyph for glyph in expected if query in glyph.search_target]
+            assert matches == expected
+            assert [match.font_id for match in matches[:2]] == font_ids
+
     def test_cached_glyphs_avoid_redownload(
         self,
         repository: IconRepository,
@@ -114,9 +190,218 @@ class TestIconRepository:
         assert repository.ensure_font(sample_font.identifier, refresh=True)
         assert recording_source.download_requests.count(sample_font.identifier) == 2
 
+    def test_refresh_skips_unchanged_codepoints(
+        self, tmp_path: Path, sample_font: IconFont, codepoints_payload: str
+    ) -> None:
+        source = RecordingFontSource("sample-source", codepoints_payload, etag='"v1"')
+        repository = IconRepository(
+            cache_dir=tmp_path, fonts=(sample_font,), font_sources=(source,)
+        )
+        assert repository.ensure_font(sample_font.identifier)
+        cache_path = repository.get_cache_path(sample_font.identifier)
+        assert cache_path is not None
+        before = cache_path.stat()
+
+        assert repository.ensure_font(sample_font.identifier, refresh=True)
+        assert source.sent_etags == [None, '"v1"']
+        assert cache_path.stat().st_mtime_ns == before.st_mtime_ns
+        assert len(repository.get_glyphs([sample_font.identifier])) == 5
+
+        source._etag = '"v2"'
+        source._payload = "bolt ea0b\n"
+        assert repository.ensure_font(sample_font.identifier, refresh=True)
+        assert [glyph.name for glyph in repository.get_glyphs([sample_font.identifier])] == ["bolt"]
+        etag_path = cache_path.with_name(f"{cache_path.name}.etag")
+        assert etag_path.read_text(encoding="utf-8") == '"v2"'
+
+    def test_font_cache_summary_reports_cached_glyphs(
+        self,
+        repository: IconRepository,
+        sample_font: IconFont,
+        recording_source: RecordingFontSource,
+    ) -> None:
+        assert repository.font_cache_summary(sample_font.identifier) == (False, 0)
+        assert repository.ensure_font(sample_font.identifier)
+        assert repository.font_cache_summary(sample_font.identifier) == (True, 5)
+        assert repository.font_cache_summary("unknown-font") == (False, 0)
+        assert recording_source.download_requests == [sample_font.identifier]
+
+    def test_font_cache_summary_follows_cache_file(
+        self, repository: IconRepository, sample_font: IconFont
+    ) -> None:
+        assert repository.ensure_font(sample_font.identifier)
+        cache_path = repository.get_cache_path(sample_font.identifier)
+        assert cache_path is not None
+        cache_path.unlink()
+        assert repository.font_cache_summary(sample_font.identifier) == (False, 0)
+        assert repository.has_cached_font(sample_font.identifier) is False
+
+    def test_parsed_glyphs_are_reused_from_pickle(
+        self,
+        tmp_path: Path,
+        sample_font: IconFont,
+        recording_source: RecordingFontSource,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        def make_repository() -> IconRepository:
+            return IconRepository(
+                cache_dir=tmp_path, fonts=(sample_font,), font_sources=(recording_source,)
+            )
+
+        expected = [glyph.name for glyph in make_repository().get_glyphs([sample_font.identifier])]
+
+        def fail_parse(self: IconRepository, data: bytes, font: IconFont) -> list[IconGlyph]:
+            raise AssertionError("codepoints were re-parsed")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(IconRepository, "_parse_codepoints", fail_parse)
+            glyphs = make_repository().get_glyphs([sample_font.identifier])
+        assert [glyph.name for glyph in glyphs] == expected
+
+        # Rewritten codepoints invalidate the pickle even with an unchanged mtime.
+        cache_path = make_repository().get_cache_path(sample_font.identifier)
+        assert cache_path is not None
+        stat = cache_path.stat()
+        cache_path.write_text("bolt ea0b\n", encoding="utf-8")
+        os.utime(cache_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        glyphs = make_repository().get_glyphs([sample_font.identifier])
+        assert [glyph.name for glyph in glyphs] == ["bolt"]
+        assert recording_source.download_requests == [sample_font.identifier]
+
+    def test_font_cache_summary_reads_recorded_count(
+        self,
+        tmp_path: Path,
+        sample_font: IconFont,
+        recording_source: RecordingFontSource,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        def make_repository() -> IconRepository:
+            return IconRepository(
+                cache_dir=tmp_path, fonts=(sample_font,), font_sources=(recording_source,)
+            )
+
+        assert make_repository().ensure_font(sample_font.identifier)
+
+        def fail_read(self: IconRepository, font: IconFont, cache_path: Path) -> list[IconGlyph]:
+            raise AssertionError("glyphs were loaded")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(IconRepository, "_read_glyphs", fail_read)
+            assert make_repository().font_cache_summary(sample_font.identifier) == (True, 5)
+
+        cache_path = make_repository().get_cache_path(sample_font.identifier)
+        assert cache_path is not None
+        cache_path.write_text("bolt ea0b\n", encoding="utf-8")
+        assert make_repository().font_cache_summary(sample_font.identifier) == (True, 1)
+
+    def test_ensure_fonts_loads_every_font(
+        self, tmp_path: Path, sample_font: IconFont, recording_source: RecordingFontSource
+    ) -> None:
+        other_font = replace(sample_font, identifier="material-symbols-other")
+        repository = IconRepository(
+            cache_dir=tmp_path,
+            fonts=(sample_font, other_font),
+            font_sources=(recording_source,),
+        )
+        repository.ensure_fonts()
+        repository.ensure_fonts()
+        assert sorted(recording_source.download_requests) == [
+            other_font.identifier,
+            sample_font.identifier,
+        ]
+        assert len(repository.get_glyphs([other_font.identifier])) == 5
+
+    def test_parse_codepoints_skips_comments_and_malformed_lines(
+        self, repository: IconRepository, sample_font: IconFont
+    ) -> None:
+        data = b"# comment e000\r\n\tbolt\tea0b\r\nbroken zzzz\nthree parts e001\n\nac_unit eb3b"
+        glyphs = repository._parse_codepoints(data, sample_font)
+        assert [(glyph.name, glyph.codepoint) for glyph in glyphs] == [
+            ("ac_unit", "eb3b"),
+            ("bolt", "ea0b"),
+        ]
+        assert glyphs[0].label == "ac unit"
+        assert glyphs[0].search_target == "ac unit outlined material symbols"
+        assert glyphs[0].font_label == "Material Symbols Outlined"
+        reparsed = repository._parse_codepoints(data, sample_font)
+        assert reparsed[0].font_label is glyphs[1].font_label
+        assert reparsed[0].font_family is glyphs[1].font_family
+
+    def test_empty_codepoints_file_has_no_glyphs(
+        self, tmp_path: Path, sample_font: IconFont
+    ) -> None:
+        repository = IconRepository(
+            cache_dir=tmp_path,
+            fonts=(sample_font,),
+            font_sources=(RecordingFontSource(identifier="sample-source", payload=""),),
+        )
+        assert repository.get_glyphs([sample_font.identifier]) == []
+        assert repository.font_cache_summary(sample_font.identifier) == (True, 0)
+
     def test_ensure_font_returns_false_for_unknown_font(self, repository: IconRepository) -> None:
         assert repository.ensure_font("unknown-font") is False
 
+    def test_ensure_fonts_by_id_reports_each_font(
+        self, tmp_path: Path, sample_font: IconFont, recording_source: RecordingFontSource
+    ) -> None:
+        other_font = replace(sample_font, identifier="material-symbols-other")
+        orphan_font = replace(sample_font, identifier="orphan", source_id="missing-source")
+        repository = IconRepository(
+            cache_dir=tmp_path,
+            fonts=(sample_font, other_font, orphan_font),
+            font_sources=(recording_source,),
+        )
+        repository.ensure_font(sample_font.identifier)
+
+        font_ids = [
+            sample_font.identifier,
+            other_font.identifier,
+            orphan_font.identifier,
+            "unknown",
+        ]
+        assert repository.ensure_fonts_by_id(font_ids) == {
+            sample_font.identifier: True,
+            other_font.identifier: True,
+            orphan_font.identifier: False,
+            "unknown": False,
+        }
+        assert sorted(recording_source.download_requests) == [
+            other_font.identifier,
+            sample_font.identifier,
+        ]
+
+    def test_concurrent_loads_of_one_font_download_once(
+        self, tmp_path: Path, sample_font: IconFont, codepoints_payload: str
+    ) -> None:
+        source = BlockingFontSource("sample-source", codepoints_payload)
+        repository = IconRepository(
+            cache_dir=tmp_path, fonts=(sample_font,), font_sources=(source,)
+        )
+        results: list[dict[str, bool]] = []
+
+        def load() -> None:
+            results.append(repository.ensure_fonts_by_id([sample_font.identifier]))
+
+        threads = [threading.Thread(target=load) for _ in range(2)]
+        threads[0].start()
+        assert source.started.wait(timeout=5)
+        threads[1].start()
+        time.sleep(0.05)  # let the second load reach the font lock
+        source.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == [{sample_font.identifier: True}] * 2
+        assert source.download_requests == [sample_font.identifier]
+        assert [glyph.name for glyph in repository.get_glyphs([sample_font.identifier])] == [
+            "10k",
+            "10mp",
+            "360",
+            "ac_unit",
+            "bolt",
+        ]
+        assert not list(tmp_path.glob("*.partial"))
+
 
 @pytest.mark.download
 class TestIconRepositoryDownload:
@@ -0,0 +1,85 @@
+"""Tests for persisting dialog state."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from state_store import PluginState
+
+
+def test_deleted_fonts_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    state = PluginState(path)
+    assert state.model.deleted_fonts == frozenset()
+
+    state.update_deleted_fonts({"remix-icon-regular", "material-symbols-sharp"})
+    assert isinstance(state.model.deleted_fonts, frozenset)
+    stored = json.loads(path.read_text())
+    assert stored["deleted_fonts"] == ["material-symbols-sharp", "remix-icon-regular"]
+
+    reloaded = PluginState(path)
+    assert reloaded.model.deleted_fonts == frozenset(
+        {
+            "material-symbols-sharp",
+            "remix-icon-regular",
+        }
+    )
+    assert isinstance(reloaded.model.deleted_fonts, frozenset)
+
+
+def test_load_ignores_invalid_deleted_fonts(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"deleted_fonts": ["remix-icon-regular", 3, None]}))
+    assert PluginState(path).model.deleted_fonts == frozenset({"remix-icon-regular"})
+
+    path.write_text(json.dumps({"deleted_fonts": "remix-icon-regular"}))
+    assert PluginState(path).model.deleted_fonts == frozenset()
+
+
+def test_update_keeps_deleted_fonts_unless_given(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    state = PluginState(path)
+    state.update_deleted_fonts(["remix-icon-regular"])
+    values = {
+        "search": "alarm",
+        "layer": state.model.layer,
+        "enabled_fonts": dict(state.model.enabled_fonts),
+        "font_size_mm": state.model.font_size_mm,
+        "font_weight": "Bold",
+    }
+
+    state.update(**values)
+    assert state.model.deleted_fonts == frozenset({"remix-icon-regular"})
+
+    state.update(**values, deleted_fonts={"material-symbols-sharp"})
+    reloaded = PluginState(path)
+    assert reloaded.model.deleted_fonts == frozenset({"material-symbols-sharp"})
+    assert reloaded.model.search == "alarm"
+    assert reloaded.model.font_weight == "Bold"
+
+
+def test_save_skips_unchanged_payload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "state.json"
+    PluginState(path).update_deleted_fonts({"remix-icon-regular"})
+    writes: list[Path] = []
+    write_text = Path.write_text
+
+    def recording_write_text(self: Path, data: str, *args: object, **kwargs: object) -> int:
+        writes.append(self)
+        return write_text(self, data, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "write_text", recording_write_text)
+
+    state = PluginState(path)
+    state.save()
+    state.update_deleted_fonts({"remix-icon-regular"})
+    assert writes == []
+
+    state.update_deleted_fonts(set())
+    state.update_deleted_fonts(set())
+    assert writes == [path.with_name("state.json.partial")]
+    assert not path.with_name("state.json.partial").exists()
+    assert json.loads(path.read_text())["deleted_fonts"] == []
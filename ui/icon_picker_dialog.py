@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import math
+from collections import OrderedDict
 from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 
@@ -16,8 +16,11 @@ from icon_fonts import (
 )
 
 
-@dataclass
+@dataclass(frozen=True)
 class IconListRow:
+    # Explicit slots (dataclass(slots=True) needs 3.10) drop the per-row __dict__.
+    __slots__ = ("font_id", "glyph", "name", "font_label", "font_family", "payload")
+
     font_id: str
     glyph: str
     name: str
@@ -26,6 +29,10 @@ class IconListRow:
     payload: object
 
 
+# Cell glyph sizes snap to this step so neighbouring cell heights share one wx.Font.
+_GLYPH_FONT_SIZE_STEP = 4
+_FONT_CACHE_SIZE = 64
+
 WX_WEIGHT_MAP: dict[str, int] = {
     "Thin": wx.FONTWEIGHT_THIN,
     "ExtraLight": wx.FONTWEIGHT_EXTRALIGHT,
@@ -40,7 +47,8 @@ WX_WEIGHT_MAP: dict[str, int] = {
 class IconGridTable(grid.GridTableBase):
     def __init__(self) -> None:
         super().__init__()
-        self._rows: list[IconListRow] = []
+        self._rows: Sequence[IconListRow] = ()
+        self._item_count = 0
         self._columns = 1
         self._row_count = 0
         self._view: grid.Grid | None = None
@@ -67,28 +75,34 @@ class IconGridTable(grid.GridTableBase):
         super().SetView(grid_view)
         self._view = grid_view
 
-    def update(self, rows: Sequence[IconListRow], columns: int) -> None:
+    def update(
+        self, rows: Sequence[IconListRow], columns: int, *, rows_changed: bool = True
+    ) -> None:
         old_rows = self._row_count
         old_cols = self._columns
-        self._rows = list(rows)
+        # Kept as given: rows may be a lazy sequence that builds items only for visible cells.
+        self._rows = rows
+        self._item_count = len(rows)
         self._columns = max(1, columns)
         self._row_count = self._calculate_row_count()
-        self._refresh_view(old_rows, old_cols)
+        self._refresh_view(old_rows, old_cols, rows_changed)
 
     def get_row_for_cell(self, row: int, col: int) -> IconListRow | None:
+        # Called several times per painted cell; wx only passes in-range coordinates,
+        # so only the padding cells after the last item need a check.
         index = row * self._columns + col
-        if 0 <= index < len(self._rows):
+        if index < self._item_count:
             return self._rows[index]
         return None
 
     def _calculate_row_count(self) -> int:
-        if not self._rows:
-            return 0
-        return math.ceil(len(self._rows) / self._columns)
+        return (self._item_count + self._columns - 1) // self._columns
 
-    def _refresh_view(self, old_rows: int, old_cols: int) -> None:
+    def _refresh_view(self, old_rows: int, old_cols: int, rows_changed: bool) -> None:
         if self._view is None:
             return
+        if not rows_changed and self._columns == old_cols and self._row_count == old_rows:
+            return
         self._view.BeginBatch()
         try:
             if self._columns != old_cols:
@@ -125,17 +139,21 @@ class IconGridTable(grid.GridTableBase):
                             diff,
                         )
                     self._view.ProcessTableMessage(msg)
-            msg = grid.GridTableMessage(self, grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES)
-            self._view.ProcessTableMessage(msg)
+            # A reflow only moves the same items between cells; the repaint below shows them.
+            if rows_changed:
+                msg = grid.GridTableMessage(self, grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES)
+                self._view.ProcessTableMessage(msg)
         finally:
+            # Closing the outermost batch recalculates the grid and repaints every window;
+            # ForceRefresh would only repeat that.
             self._view.EndBatch()
-            self._view.ForceRefresh()
 
 
 class IconCellRenderer(grid.GridCellRenderer):
     def __init__(self, font_lookup: Callable[[str, str, int], wx.Font | None]) -> None:
         super().__init__()
         self._font_lookup = font_lookup
+        self._brushes: dict[bool, tuple[wx.Colour, wx.Brush]] = {}
 
     def Draw(  # noqa: N802 - wx override
         self,
@@ -158,11 +176,11 @@ class IconCellRenderer(grid.GridCellRenderer):
             background = grid_view.GetBackgroundColour()
             foreground = grid_view.GetForegroundColour()
         dc.SetPen(wx.TRANSPARENT_PEN)
-        dc.SetBrush(wx.Brush(background))
+        dc.SetBrush(self._background_brush(background, isSelected))
         dc.DrawRectangle(rect)
         if item is None:
             return
-        font_size = max(24, int(rect.Height * 0.7))
+        font_size = max(24, int(rect.Height * 0.7) // _GLYPH_FONT_SIZE_STEP * _GLYPH_FONT_SIZE_STEP)
         font = self._font_lookup(item.font_id, item.font_family, font_size)
         if font is None:
             font = wx.Font(wx.FontInfo(font_size))
@@ -170,6 +188,13 @@ class IconCellRenderer(grid.GridCellRenderer):
         dc.SetTextForeground(foreground)
         dc.DrawLabel(item.glyph, rect, wx.ALIGN_CENTER_HORIZONTAL | wx.ALIGN_CENTER_VERTICAL)
 
+    def _background_brush(self, colour: wx.Colour, selected: bool) -> wx.Brush:
+        # One brush per cell state, rebuilt only when the theme or grid colour changes.
+        cached = self._brushes.get(selected)
+        if cached is None or cached[0] != colour:
+            cached = self._brushes[selected] = (wx.Colour(colour), wx.Brush(colour))
+        return cached[1]
+
     def GetBestSize(  # noqa: N802 - wx override
         self,
         grid_view: grid.Grid,
@@ -197,17 +222,19 @@ class IconGrid(grid.Grid):
         self._min_cell_size = min_cell
         self._cell_size = min_cell
         self._columns = 1
-        self._rows: list[IconListRow] = []
+        self._rows: Sequence[IconListRow] = ()
+        self._resize_timer: wx.CallLater | None = None
         self._table = IconGridTable()
         self.SetTable(self._table, takeOwnership=True)
         self._configure_appearance()
         self.SetDefaultRenderer(IconCellRenderer(self._font_lookup))
         self.Bind(wx.EVT_SIZE, self._handle_resize)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._handle_destroy)
 
     def set_rows(self, rows: Sequence[IconListRow]) -> None:
         self.Freeze()
         try:
-            self._rows = list(rows)
+            self._rows = rows
             self._table.update(self._rows, self._columns)
             self.ClearSelection()
             if self._rows and self._table.GetNumberRows() > 0:
@@ -217,12 +244,12 @@ class IconGrid(grid.Grid):
         self._update_layout()
 
     def get_selected_row(self) -> IconListRow | None:
-        row = self.GetGridCursorRow()
-        col = self.GetGridCursorCol()
+        return self.get_row_at(self.GetGridCursorRow(), self.GetGridCursorCol())
+
+    def get_row_at(self, row: int, col: int) -> IconListRow | None:
         if row < 0 or col < 0:
             return None
-        item = self._table.get_row_for_cell(row, col)
-        return item
+        return self._table.get_row_for_cell(row, col)
 
     def get_row_count(self) -> int:
         return len(self._rows)
@@ -241,27 +268,42 @@ class IconGrid(grid.Grid):
 
     def _handle_resize(self, event: wx.SizeEvent) -> None:
         event.Skip()
-        wx.CallAfter(self._update_layout)
+        # Dragging the dialog edge fires a stream of size events; lay out once it settles.
+        if self._resize_timer is not None and self._resize_timer.IsRunning():
+            self._resize_timer.Restart(settings.ICON_GRID_RESIZE_SETTLE_MS)
+        else:
+            self._resize_timer = wx.CallLater(
+                settings.ICON_GRID_RESIZE_SETTLE_MS, self._handle_resize_settled
+            )
+
+    def _handle_resize_settled(self) -> None:
+        # The grid may be gone if the dialog was destroyed before the timer was stopped.
+        if not self:
+            return
+        self._update_layout()
+
+    def _handle_destroy(self, event: wx.WindowDestroyEvent) -> None:
+        event.Skip()
+        # Destroy events from child windows propagate here as well.
+        if event.GetEventObject() is self and self._resize_timer is not None:
+            self._resize_timer.Stop()
+            self._resize_timer = None
 
     def _update_layout(self) -> None:
         width = max(self.GetClientSize().width, self._min_cell_size)
         desired_columns = max(1, width // self._min_cell_size)
+        cell_size = max(self._min_cell_size, width // desired_columns)
+        if desired_columns == self._columns and cell_size == self._cell_size:
+            return
         if desired_columns != self._columns:
             self._columns = desired_columns
-            self._table.update(self._rows, self._columns)
-        if self._columns == 0:
-            return
-        cell_size = max(self._min_cell_size, width // self._columns)
-        if cell_size != self._cell_size:
-            self._cell_size = cell_size
+            self._table.update(self._rows, self._columns, rows_changed=False)
+        self._cell_size = cell_size
         self.Freeze()
         try:
+            # resizeExistingRows=True resizes every row and column; none are sized individually.
             self.SetDefaultColSize(self._cell_size, True)
             self.SetDefaultRowSize(self._cell_size, True)
-            for col in range(self._columns):
-                self.SetColSize(col, self._cell_size)
-            for row in range(self._table.GetNumberRows()):
-                self.SetRowSize(row, self._cell_size)
         finally:
             self.Thaw()
 
@@ -286,8 +328,14 @@ class IconPickerDialog(wx.Dialog):
         )
 
         self.layers = list(layers)
+        # Keyed by value, not id(): restored state holds a plain int equal to the enum member.
+        self._layer_indices: dict[object, int] = {}
         self._font_checkboxes: dict[str, wx.CheckBox] = {}
-        self._font_render_map: dict[tuple[str, str, int, str], wx.Font] = {}
+        # Checked font ids in checkbox order; dropped whenever a checkbox changes.
+        self._enabled_fonts: tuple[str, ...] | None = None
+        self._font_render_map: OrderedDict[tuple[str, str, int, str], wx.Font] = OrderedDict()
+        # Fonts for the current weight selection, so painting a cell skips resolving the weight.
+        self._current_fonts: dict[tuple[str, str, int], wx.Font] = {}
         self._font_weights: dict[str, tuple[str, ...]] = {}
         self._set_font_metadata(fonts, font_weights)
         self._default_preview_font = wx.Font(wx.FontInfo(96))
@@ -348,6 +396,8 @@ class IconPickerDialog(wx.Dialog):
             style=wx.ALIGN_CENTER_HORIZONTAL,
         )
         self.preview_glyph.SetFont(self._default_preview_font)
+        self._preview_font = self._default_preview_font
+        self._preview_layout_pending = False
         preview_content.Add(self.preview_glyph, 0, wx.ALIGN_CENTER_HORIZONTAL | wx.BOTTOM, 10)
 
         self.preview_caption = wx.StaticText(
@@ -355,6 +405,9 @@ class IconPickerDialog(wx.Dialog):
             label="Select an icon",
             style=wx.ALIGN_CENTER_HORIZONTAL,
         )
+        self._preview_labels = ("", "Select an icon")
+        # Empty until the first update; None once the "nothing selected" preview is shown.
+        self._preview_key: tuple[str, ...] | None = ()
         preview_content.Add(self.preview_caption, 0, wx.ALIGN_CENTER_HORIZONTAL)
         preview_content.AddStretchSpacer()
 
@@ -422,7 +475,7 @@ class IconPickerDialog(wx.Dialog):
 
         # Event wiring
         self.search_ctrl.Bind(wx.EVT_TEXT, self._handle_search)
-        self.search_ctrl.Bind(wx.EVT_TEXT_ENTER, self._handle_search)
+        self.search_ctrl.Bind(wx.EVT_TEXT_ENTER, self._handle_search_enter)
         self.icon_grid.Bind(grid.EVT_GRID_SELECT_CELL, self._handle_grid_selection)
         self.icon_grid.Bind(grid.EVT_GRID_CELL_LEFT_DCLICK, self._handle_icon_activated)
         self.add_button.Bind(wx.EVT_BUTTON, self._handle_add)
@@ -436,12 +489,10 @@ class IconPickerDialog(wx.Dialog):
 
     def _populate_fonts(self) -> None:
         for identifier, label in self.fonts:
-            checkbox = wx.CheckBox(self.font_box, label=label)
+            # The window name carries the font id, so every checkbox shares one handler.
+            checkbox = wx.CheckBox(self.font_box, label=label, name=identifier)
             checkbox.SetValue(True)
-            checkbox.Bind(
-                wx.EVT_CHECKBOX,
-                lambda event, font_id=identifier: self._handle_font_checkbox(font_id, event),
-            )
+            checkbox.Bind(wx.EVT_CHECKBOX, self._handle_font_checkbox)
             self.font_grid.Add(checkbox, 0, wx.ALL, 2)
             self._font_checkboxes[identifier] = checkbox
         self._update_weight_availability()
@@ -454,13 +505,15 @@ class IconPickerDialog(wx.Dialog):
         for checkbox in self._font_checkboxes.values():
             checkbox.Destroy()
         self._font_checkboxes.clear()
+        self._enabled_fonts = None
         self.font_grid.Clear(True)
         self._set_font_metadata(fonts, font_weights)
         self._populate_fonts()
         self.Layout()
 
-    def _handle_font_checkbox(self, font_id: str, event: wx.CommandEvent) -> None:
-        self.on_font_toggled(font_id, event.IsChecked())
+    def _handle_font_checkbox(self, event: wx.CommandEvent) -> None:
+        self._enabled_fonts = None
+        self.on_font_toggled(event.GetEventObject().GetName(), event.IsChecked())
         self._update_weight_availability()
 
     def _update_weight_availability(self) -> None:
@@ -470,6 +523,7 @@ class IconPickerDialog(wx.Dialog):
         value_changed = False
         if not supports_bold and current_value:
             self.weight_checkbox.SetValue(False)
+            self._current_fonts.clear()
             value_changed = True
         if value_changed:
             self.icon_grid.ForceRefresh()
@@ -484,20 +538,24 @@ class IconPickerDialog(wx.Dialog):
 
     def _populate_layers(self) -> None:
         for label, payload in self.layers:
-            self.layer_choice.Append(label, payload)
+            self._layer_indices.setdefault(payload, self.layer_choice.Append(label, payload))
         if self.layer_choice.GetCount() > 0:
             self.layer_choice.SetSelection(0)
 
     def _handle_search(self, _: wx.Event) -> None:
         self.on_search_changed(self.search_ctrl.GetValue())
 
+    def _handle_search_enter(self, _: wx.Event) -> None:
+        self.on_search_submitted(self.search_ctrl.GetValue())
+
     def _handle_dialog_resize(self, event: wx.SizeEvent) -> None:
         event.Skip()
         self.Layout()
 
     def _handle_grid_selection(self, event: grid.GridEvent) -> None:
         event.Skip()
-        wx.CallAfter(self._update_icon_activated)
+        # The grid cursor still points at the old cell here, so read the target from the event.
+        self._update_icon_activated(self.icon_grid.get_row_at(event.GetRow(), event.GetCol()))
 
     def _handle_icon_activated(self, _: wx.Event) -> None:
         self.on_icon_activated()
@@ -513,6 +571,7 @@ class IconPickerDialog(wx.Dialog):
         self._update_font_size_label(self.font_size_slider.GetValue())
 
     def _handle_weight_change(self, _: wx.CommandEvent) -> None:
+        self._current_fonts.clear()
         self.icon_grid.ForceRefresh()
         self._update_preview(self.get_selected_row())
         self.on_weight_changed(self.get_font_weight())
@@ -520,31 +579,38 @@ class IconPickerDialog(wx.Dialog):
     def _handle_manage_fonts(self, _: wx.CommandEvent) -> None:
         self.on_manage_fonts_requested()
 
-    def _update_icon_activated(self) -> None:
-        row = self.get_selected_row()
+    def _update_icon_activated(self, row: IconListRow | None) -> None:
         self.add_button.Enable(row is not None)
         self._update_preview(row)
 
     def _update_preview(self, row: IconListRow | None) -> None:
+        key = (
+            None
+            if row is None
+            else (row.font_id, row.font_family, row.glyph, row.name, self.get_font_weight())
+        )
+        if key == self._preview_key:
+            return
+        self._preview_key = key
         if row is None:
-            self.preview_glyph.SetFont(self._default_preview_font)
-            self.preview_glyph.SetLabel("")
-            self.preview_caption.SetLabel("Select an icon to preview")
+            font_changed = self._set_preview_font(self._default_preview_font)
+            labels_changed = self._set_preview_labels("", "Select an icon to preview")
+        else:
+            preview_font = self._get_font_for_id(row.font_id, row.font_family, 120)
+            if preview_font is None:
+                preview_font = self._default_preview_font
+            font_changed = self._set_preview_font(preview_font)
+            labels_changed = self._set_preview_labels(row.glyph, row.name)
+        if font_changed or labels_changed:
             self._refresh_preview_layout()
-            return
-
-        preview_font = self._get_font_for_id(row.font_id, row.font_family, 120)
-        if preview_font is None:
-            preview_font = self._default_preview_font
-        self.preview_glyph.SetFont(preview_font)
-        self.preview_glyph.SetLabel(row.glyph)
-        self.preview_caption.SetLabel(row.name)
-        self._refresh_preview_layout()
 
     # --- Hooks for subclasses -------------------------------------------------
     def on_search_changed(self, value: str) -> None:  # pragma: no cover - virtual
         pass
 
+    def on_search_submitted(self, value: str) -> None:  # pragma: no cover - virtual
+        self.on_search_changed(value)
+
     def on_font_toggled(self, font_id: str, enabled: bool) -> None:  # pragma: no cover - virtual
         pass
 
@@ -584,27 +650,33 @@ class IconPickerDialog(wx.Dialog):
         self.Layout()
 
     def set_font_selected(self, font_id: str, enabled: bool) -> None:
-        checkbox = self._font_checkboxes.get(font_id)
-        if checkbox is None:
-            return
-        checkbox.SetValue(enabled)
+        self.set_fonts_selected({font_id: enabled})
+
+    def set_fonts_selected(self, selection: Mapping[str, bool]) -> None:
+        """Set several checkboxes, then update dependent state once; fires no toggle events."""
+        for font_id, enabled in selection.items():
+            checkbox = self._font_checkboxes.get(font_id)
+            if checkbox is not None:
+                checkbox.SetValue(enabled)
+        self._enabled_fonts = None
         self._update_weight_availability()
 
     def get_enabled_fonts(self) -> list[str]:
-        result = []
-        for font_id, checkbox in self._font_checkboxes.items():
-            if checkbox.GetValue():
-                result.append(font_id)
-        return result
+        if self._enabled_fonts is None:
+            self._enabled_fonts = tuple(
+                font_id
+                for font_id, checkbox in self._font_checkboxes.items()
+                if checkbox.GetValue()
+            )
+        return list(self._enabled_fonts)
 
     def set_search_text(self, text: str) -> None:
         self.search_ctrl.SetValue(text)
 
     def set_layer_value(self, payload: object) -> None:
-        for index in range(self.layer_choice.GetCount()):
-            if self.layer_choice.GetClientData(index) == payload:
-                self.layer_choice.SetSelection(index)
-                return
+        index = self._layer_indices.get(payload)
+        if index is not None:
+            self.layer_choice.SetSelection(index)
 
     def get_layer_value(self) -> object | None:
         index = self.layer_choice.GetSelection()
@@ -614,7 +686,7 @@ class IconPickerDialog(wx.Dialog):
 
     def set_rows(self, rows: Sequence[IconListRow]) -> None:
         self.icon_grid.set_rows(rows)
-        self._update_icon_activated()
+        self._update_icon_activated(self.get_selected_row())
         self.set_status(f"Showing {self.icon_grid.get_row_count()} icons")
         self._update_preview(None)
 
@@ -631,6 +703,7 @@ class IconPickerDialog(wx.Dialog):
 
     def set_font_weight(self, weight_name: str) -> None:
         self.weight_checkbox.SetValue(weight_name == BOLD_FONT_WEIGHT)
+        self._current_fonts.clear()
 
     def get_font_weight(self) -> str:
         if self.weight_checkbox.GetValue():
@@ -642,23 +715,70 @@ class IconPickerDialog(wx.Dialog):
         return resolve_weight_choice(self.get_font_weight(), available)
 
     def _get_font_for_id(self, font_id: str, family: str, size: int = 24) -> wx.Font | None:
+        current_key = (font_id, family, size)
+        font = self._current_fonts.get(current_key)
+        if font is None:
+            if len(self._current_fonts) >= _FONT_CACHE_SIZE:
+                self._current_fonts.clear()
+            font = self._current_fonts[current_key] = self._get_weighted_font(font_id, family, size)
+        return font
+
+    def _get_weighted_font(self, font_id: str, family: str, size: int) -> wx.Font:
         resolved_weight = self.get_resolved_font_weight(font_id)
         key = (font_id, family, size, resolved_weight)
-        if key not in self._font_render_map:
-            weight_value = WX_WEIGHT_MAP.get(resolved_weight, wx.FONTWEIGHT_NORMAL)
-            info = wx.FontInfo(size).FaceName(family).Weight(weight_value)
-            font = wx.Font(info)
-            if not font.IsOk():
-                font = wx.Font(wx.FontInfo(size).Weight(weight_value))
-            self._font_render_map[key] = font
-        return self._font_render_map[key]
+        font = self._font_render_map.get(key)
+        if font is not None:
+            self._font_render_map.move_to_end(key)
+            return font
+        weight_value = WX_WEIGHT_MAP.get(resolved_weight, wx.FONTWEIGHT_NORMAL)
+        info = wx.FontInfo(size).FaceName(family).Weight(weight_value)
+        font = wx.Font(info)
+        if not font.IsOk():
+            font = wx.Font(wx.FontInfo(size).Weight(weight_value))
+        self._font_render_map[key] = font
+        if len(self._font_render_map) > _FONT_CACHE_SIZE:
+            self._font_render_map.popitem(last=False)
+        return font
+
+    def _set_preview_font(self, font: wx.Font) -> bool:
+        # Fonts come from the render cache, so an unchanged font is the same object.
+        if font is self._preview_font:
+            return False
+        self.preview_glyph.SetFont(font)
+        self._preview_font = font
+        return True
+
+    def _set_preview_labels(self, glyph: str, caption: str) -> bool:
+        if (glyph, caption) == self._preview_labels:
+            return False
+        self.preview_glyph.SetLabel(glyph)
+        self.preview_caption.SetLabel(caption)
+        self._preview_labels = (glyph, caption)
+        return True
 
     def _refresh_preview_layout(self) -> None:
+        # set_rows and selection changes update the preview several times per event;
+        # they share one layout pass once the event has been handled.
+        if self._preview_layout_pending:
+            return
+        self._preview_layout_pending = True
+        wx.CallAfter(self._apply_preview_layout)
+
+    def _apply_preview_layout(self) -> None:
+        self._preview_layout_pending = False
+        if self.IsBeingDeleted():
+            return
         self.preview_glyph.InvalidateBestSize()
         self.preview_caption.InvalidateBestSize()
         sizer = self.preview_glyph.GetContainingSizer()
         if sizer is not None:
+            # Re-centre the labels within the preview box; the rest of the dialog only
+            # needs a layout pass when the new labels no longer fit in the box.
             sizer.Layout()
+            needed = sizer.GetMinSize()
+            available = sizer.GetSize()
+            if needed.width <= available.width and needed.height <= available.height:
+                return
         self.Layout()
 
     def _update_font_size_label(self, value: int) -> None:
@@ -675,6 +795,8 @@ class IconPickerDialog(wx.Dialog):
         self.fonts = list(fonts)
         resolved_weights = font_weights or {}
         self._font_weights.clear()
+        self._current_fonts.clear()
+        self._preview_key = ()
         for identifier, _ in self.fonts:
             available = tuple(
                 weight
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from collections.abc import Sequence
 from typing import Callable
 
@@ -23,6 +24,7 @@ class ManageIconSetsDialog(wx.Dialog):
             style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
         )
         self._rows: list[FontStatusRow] = []
+        self._row_text_cache: dict[FontStatusRow, tuple[str, ...]] = {}
         self._selected_ids: set[str] = set()
         self._busy = False
         self._install_handler: Callable[[Sequence[str]], None] | None = None
@@ -97,27 +99,33 @@ class ManageIconSetsDialog(wx.Dialog):
         preserved = set(row.identifier for row in rows)
         self._selected_ids.intersection_update(preserved)
         self._rows = list(rows)
-        self.list_ctrl.DeleteAllItems()
-        for row in self._rows:
-            is_selected = row.identifier in self._selected_ids
-            ttf_status = self._font_installed_label(row)
-            wx_status = "Yes" if row.wx_available else "No"
-            website = row.info_url or "-"
-            license_text = row.license_text or "-"
-            self.list_ctrl.AppendItem(
-                [
-                    is_selected,
-                    row.family,
-                    ttf_status,
-                    wx_status,
-                    str(row.weights_count),
-                    "?" if not row.wx_available else str(row.glyph_count),
-                    website,
-                    license_text,
-                ]
-            )
+        # Rows are frozen dataclasses, so an unchanged row reuses its formatted columns.
+        previous = self._row_text_cache
+        self._row_text_cache = {row: previous.get(row) or self._row_text(row) for row in self._rows}
+        items = [
+            [row.identifier in self._selected_ids, *self._row_text_cache[row]] for row in self._rows
+        ]
+        # Frozen so the control repaints once after the refill rather than per appended row.
+        self.list_ctrl.Freeze()
+        try:
+            self.list_ctrl.DeleteAllItems()
+            for item in items:
+                self.list_ctrl.AppendItem(item)
+        finally:
+            self.list_ctrl.Thaw()
         self._update_button_states()
 
+    def _row_text(self, row: FontStatusRow) -> tuple[str, ...]:
+        return (
+            row.family,
+            self._font_installed_label(row),
+            "Yes" if row.wx_available else "No",
+            str(row.weights_count),
+            "?" if not row.wx_available else str(row.glyph_count),
+            row.info_url or "-",
+            row.license_text or "-",
+        )
+
     def _font_installed_label(self, row: FontStatusRow) -> str:
         if row.is_installed:
             return "User"
@@ -174,34 +182,44 @@ class ManageIconSetsDialog(wx.Dialog):
 
     def _handle_item_changed(self, event: dv.DataViewEvent) -> None:
         """Handle checkbox value changes on platforms where the event fires reliably."""
-        row_index = event.GetRow()
-        column = event.GetColumn()
-        if column != 0 or row_index < 0 or row_index >= len(self._rows):
+        if event.GetColumn() != 0:
             return
-
-        identifier = self._rows[row_index].identifier
-        is_checked = self.list_ctrl.GetValue(row_index, 0)
-        if is_checked:
-            self._selected_ids.add(identifier)
-        else:
-            self._selected_ids.discard(identifier)
-        self._update_button_states()
+        self._sync_checkbox_row(event.GetRow())
 
     def _handle_selection_changed(self, event: dv.DataViewEvent) -> None:
         """
         Handle row selection changes.
-        On macOS this catches checkbox clicks when switching between rows.
+        On macOS this catches checkbox clicks when switching between rows; elsewhere
+        EVT_DATAVIEW_ITEM_VALUE_CHANGED already reports every toggle.
         """
-        self._sync_checkbox_states()
+        if sys.platform == "darwin":
+            self._sync_checkbox_states()
 
     def _handle_list_click(self, event: wx.MouseEvent) -> None:
         """
         Handle mouse clicks on the list control.
         On macOS this is the fallback for detecting same-row checkbox toggles.
-        Uses CallLater to allow the native control to update before reading state.
+        Uses CallLater to allow the native control to update before reading state, and
+        only re-reads the clicked row.
         """
         event.Skip()
-        wx.CallLater(250, self._sync_checkbox_states)
+        item, _ = self.list_ctrl.HitTest(event.GetPosition())
+        if not item.IsOk():
+            return
+        wx.CallLater(250, self._sync_checkbox_row, self.list_ctrl.ItemToRow(item))
+
+    def _sync_checkbox_row(self, row_index: int) -> None:
+        if row_index < 0 or row_index >= len(self._rows):
+            return
+        identifier = self._rows[row_index].identifier
+        is_checked = bool(self.list_ctrl.GetValue(row_index, 0))
+        if is_checked == (identifier in self._selected_ids):
+            return
+        if is_checked:
+            self._selected_ids.add(identifier)
+        else:
+            self._selected_ids.discard(identifier)
+        self._update_button_states()
 
     def _handle_item_activated(self, event: dv.DataViewEvent) -> None:
         """Handle double-click on website column to open URL in browser."""